@@ -0,0 +1,100 @@
+import os
+
+import pygame
+
+from atlas import load_atlas, pack_atlas
+
+
+# The game's images, wherever it is started from.
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'images')
+
+
+class Assets:
+    """A class to load the game's images once and share them."""
+
+    def __init__(self, image_dir=IMAGE_DIR):
+        """Initialize an empty image cache."""
+        self.image_dir = image_dir
+        self._images = {}
+        self._atlases = {}
+        self._masks = {}
+
+    def image(self, name):
+        """
+        Return the image stored in images/<name>.bmp.
+        The image is read from disk and converted to the display's
+        pixel format only the first time it is asked for.
+        """
+        image = self._images.get(name)
+        if image is None:
+            image = self._load(name)
+            self._images[name] = image
+        return image
+
+    def mask(self, name):
+        """
+        Return the collision mask of images/<name>.bmp, built from
+        its opaque pixels the first time it is asked for.
+        """
+        mask = self._masks.get(name)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.image(name))
+            self._masks[name] = mask
+        return mask
+
+    def atlas(self, name, members):
+        """
+        Return the sprite sheet images/<name>.bmp holding the images in
+        members. If the sheet is not on disk it is packed from the
+        separate images the first time it is asked for.
+        """
+        atlas = self._atlases.get(name)
+        if atlas is None:
+            path = f"{self.image_dir}/{name}"
+            if os.path.exists(f"{path}.json"):
+                atlas = load_atlas(path)
+            else:
+                atlas = pack_atlas({member: self.image(member)
+                                    for member in members})
+            atlas.surface = self._convert(atlas.surface)
+            self._atlases[name] = atlas
+        return atlas
+
+    def scaled_atlas(self, name, members, scale):
+        """
+        Return the sprite sheet name with every image scaled by scale,
+        converted to the display's pixel format. Each scale is built
+        only the first time it is asked for.
+        """
+        if scale == 1.0:
+            return self.atlas(name, members)
+        atlas = self._atlases.get((name, scale))
+        if atlas is None:
+            atlas = self.atlas(name, members).scaled(scale)
+            atlas.surface = self._convert(atlas.surface)
+            self._atlases[(name, scale)] = atlas
+        return atlas
+
+    def _load(self, name):
+        """Load an image and convert it to the display's pixel format."""
+        return self._convert(
+            pygame.image.load(f"{self.image_dir}/{name}.bmp"))
+
+    def _convert(self, image):
+        """Convert an image to the display's pixel format."""
+        # Conversion needs a display mode; without one keep the raw image.
+        if pygame.display.get_surface() is None:
+            return image
+
+        # Keep per-pixel alpha if the image has it, so blits use the
+        # fast alpha path instead of converting pixels on every blit.
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+    def clear(self):
+        """Forget every cached image, sprite sheet and mask."""
+        self._images.clear()
+        self._atlases.clear()
+        self._masks.clear()
@@ -0,0 +1,69 @@
+import json
+
+import pygame
+
+
+class Atlas:
+    """
+    A class to keep several images in one surface, a sprite sheet.
+    Each image is a named rect of the sheet, so every sprite of a layer
+    can be drawn from the same surface in one Surface.blits call.
+
+    On disk a sheet is <name>.bmp with <name>.json next to it, mapping
+    each image name to its [x, y, width, height] in the sheet.
+    """
+
+    def __init__(self, surface, regions):
+        """Initialize the atlas from a sheet and its named rects."""
+        self.surface = surface
+        self.regions = {name: pygame.Rect(rect)
+                        for name, rect in regions.items()}
+
+    def region(self, name):
+        """Return the rect of the named image within the sheet."""
+        return self.regions[name]
+
+    def size(self, name):
+        """Return the width and height of the named image."""
+        return self.regions[name].size
+
+    def scaled(self, scale):
+        """Return a copy of the atlas with every image scaled by scale."""
+        return pack_atlas({
+            name: pygame.transform.smoothscale(
+                self.surface.subsurface(rect),
+                (max(1, round(rect.width * scale)),
+                 max(1, round(rect.height * scale))))
+            for name, rect in self.regions.items()})
+
+    def save(self, path):
+        """Write the sheet to path.bmp and its rects to path.json."""
+        pygame.image.save(self.surface, f"{path}.bmp")
+        with open(f"{path}.json", 'w') as f:
+            json.dump({name: list(rect)
+                       for name, rect in self.regions.items()}, f, indent=2)
+
+
+def pack_atlas(images):
+    """Return an Atlas of the named images, placed side by side."""
+    width = sum(image.get_width() for image in images.values())
+    height = max(image.get_height() for image in images.values())
+    sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+
+    regions = {}
+    x = 0
+    for name, image in images.items():
+        # Copy the pixels and their alpha as they are, without blending.
+        regions[name] = sheet.blit(image, (x, 0),
+                                   special_flags=pygame.BLEND_RGBA_MAX)
+        x += image.get_width()
+    return Atlas(sheet, regions)
+
+
+def load_atlas(path):
+    """Return the Atlas stored in path.bmp and path.json."""
+    sheet = pygame.image.load(f"{path}.bmp")
+    with open(f"{path}.json") as f:
+        regions = json.load(f)
+    return Atlas(sheet, regions)
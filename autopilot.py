@@ -0,0 +1,40 @@
+import random
+
+import numpy as np
+
+
+class Autopilot:
+    """
+    A scripted player that steers under the lowest spaceship and fires.
+    It hesitates now and then, so games with different seeds differ.
+    """
+
+    def __init__(self, sb_game, seed=None, hesitation=0.1):
+        """Initialize the player for sb_game."""
+        self.sb_game = sb_game
+        self.rng = random.Random(seed)
+
+        # Chance on each tick that the player does nothing new.
+        self.hesitation = hesitation
+
+    def act(self):
+        """Set the rocket's movement flags and fire for the next tick."""
+        game = self.sb_game
+        if self.rng.random() < self.hesitation:
+            return
+
+        rocket = game.rocket
+        fleet = game.spaceships
+        rocket.moving_left = rocket.moving_right = False
+        if not len(fleet):
+            return
+
+        # Chase the lowest living spaceship; it is the biggest threat.
+        living = np.flatnonzero(fleet.alive)
+        target = living[np.argmax(fleet.y[living])]
+        target_x = fleet.x[target] + fleet.width / 2
+        if target_x < rocket.rect.centerx - 2:
+            rocket.moving_left = True
+        elif target_x > rocket.rect.centerx + 2:
+            rocket.moving_right = True
+        game._fire_bullet()
@@ -0,0 +1,236 @@
+"""
+Run the game headless through scripted load scenarios and report
+how long the update and render steps take.
+
+    python benchmark.py --ticks 2000 --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# Before pygame, so its greeting stays off stdout.
+from headless import summarize, use_dummy_drivers
+
+import numpy as np
+import pygame
+
+from input_recording import InputReader, InputReplay
+from space_battle import SpaceBattle
+
+# The game runs without a window.
+use_dummy_drivers()
+
+
+def _fill_formation(game, number, top=60, bottom=400, margin=0.1):
+    """Replace the fleet with a dense grid of about number spaceships."""
+    fleet = game.spaceships
+    width = game.settings.screen_width * (1 - 2 * margin)
+    height = bottom - top
+    columns = max(1, int(np.sqrt(number * width / height)))
+    rows = max(1, -(-number // columns))
+    left = game.settings.screen_width * margin
+    xs = np.linspace(0, width - fleet.width, columns) + left
+    ys = np.linspace(top, bottom - fleet.height, rows)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    fleet.populate(grid_x.ravel()[:number], grid_y.ravel()[:number])
+
+
+def _keep_alive(game):
+    """Stop the rocket from running out of lives during a scenario."""
+    game.stats.rockets_left = 10 ** 6
+
+
+class Scenario:
+    """A scripted workload: prepares a game and drives it every tick."""
+
+    def __init__(self, name, setup=None, step=None):
+        """Initialize a scenario from optional setup and step functions."""
+        self.name = name
+        self._setup = setup
+        self._step = step
+
+    def setup(self, game):
+        """Start a new game and apply the scenario's changes to it."""
+        game._press_play_button(game.start_button.field_rect.center)
+        _keep_alive(game)
+        if self._setup:
+            self._setup(game)
+
+    def step(self, game, tick):
+        """Drive the game before the given tick."""
+        if self._step:
+            self._step(game, tick)
+
+
+class ReplayScenario(Scenario):
+    """A workload that replays a recorded game, click and keys included."""
+
+    def __init__(self, path):
+        """Initialize a scenario that replays the recording at path."""
+        super().__init__(f'replay:{path}')
+        self.path = path
+        self._replay = None
+
+    def setup(self, game):
+        """Start the replay from a fresh game."""
+        self._replay = InputReplay(game, InputReader(self.path))
+
+    def step(self, game, tick):
+        """Apply the inputs recorded before the given tick."""
+        self._replay.apply(tick)
+
+
+def _default_step(game, tick):
+    """Sweep the rocket across the screen and fire regularly."""
+    game.rocket.moving_left = (tick // 240) % 2 == 0
+    game.rocket.moving_right = not game.rocket.moving_left
+    if tick % 10 == 0:
+        game._fire_bullet()
+
+
+def _large_fleet(number):
+    """Return a setup function that creates a fleet of number spaceships."""
+    def setup(game):
+        game.settings.fleet_drop_speed = 0
+        _fill_formation(game, number)
+    return setup
+
+
+def _many_bullets_setup(game):
+    """Allow thousands of slow bullets on the screen at once."""
+    game.settings.bullets_allowed = 2000
+    game.settings.bullet_speed = 200.0
+
+
+def _many_bullets_step(game, tick):
+    """Fire a bullet on every tick while sweeping the rocket."""
+    _default_step(game, tick)
+    game._fire_bullet()
+
+
+def _edge_bounce_setup(game):
+    """Create a fleet that bounces off an edge on every tick."""
+    # A formation as wide as the screen touches an edge on every tick.
+    game.settings.fleet_drop_speed = 0
+    _fill_formation(game, 500, margin=0)
+
+
+def _level_up_setup(game):
+    """Bring in each new fleet on the tick after the last one is cleared."""
+    game.settings.level_pause = 0
+
+
+def _level_up_step(game, tick):
+    """Destroy the whole fleet so the game levels up on every tick."""
+    _default_step(game, tick)
+    game.spaceships.kill(np.flatnonzero(game.spaceships.alive))
+    game._increase_difficulty()
+
+    # Speeds grow exponentially with the level, so start over every
+    # 20 levels before they overflow the screen coordinates.
+    if tick % 20 == 0:
+        game.settings.initialize_dynamic_settings()
+
+
+SCENARIOS = [
+    Scenario('default_fleet', step=_default_step),
+    Scenario('large_fleet_2k', _large_fleet(2000), _default_step),
+    Scenario('large_fleet_10k', _large_fleet(10000), _default_step),
+    Scenario('many_bullets', _many_bullets_setup, _many_bullets_step),
+    Scenario('edge_bounces', _edge_bounce_setup, _default_step),
+    Scenario('rapid_level_ups', _level_up_setup, _level_up_step),
+]
+
+
+def run_scenario(game, scenario, ticks, warmup):
+    """Run one scenario and return its timings."""
+    scenario.setup(game)
+    dt = game.clock.dt
+    perf_counter = time.perf_counter
+    update_times = []
+    render_times = []
+
+    start = perf_counter()
+    for tick in range(warmup + ticks):
+        scenario.step(game, tick)
+
+        t0 = perf_counter()
+        game._update_positions(dt)
+        t1 = perf_counter()
+        game._update_screen()
+        t2 = perf_counter()
+
+        if tick == warmup:
+            start = t0
+        if tick >= warmup:
+            update_times.append(t1 - t0)
+            render_times.append(t2 - t1)
+    elapsed = perf_counter() - start
+
+    # End the game so the next scenario starts from the Start button.
+    game.stats.set_state(game.stats.GAME_OVER)
+    return {
+        'ticks': ticks,
+        'seconds': elapsed,
+        'ticks_per_sec': ticks / elapsed if elapsed else None,
+        'spaceships_at_end': len(game.spaceships),
+        'update_positions': summarize(update_times),
+        'update_screen': summarize(render_times),
+    }
+
+
+def main(argv=None):
+    """Run the selected scenarios and write their timings as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=2000,
+                        help="measured ticks per scenario")
+    parser.add_argument('--warmup', type=int, default=100,
+                        help="ticks run before measuring")
+    parser.add_argument('--scenario', action='append',
+                        choices=[s.name for s in SCENARIOS],
+                        help="run only this scenario (may be repeated)")
+    parser.add_argument('--replay', action='append', default=[],
+                        help="also run a recorded game as a scenario "
+                             "(may be repeated)")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # The game draws to the display, but nobody is playing it.
+    game = SpaceBattle(scripted=True)
+    results = {}
+    scenarios = [s for s in SCENARIOS
+                 if not args.scenario or s.name in args.scenario]
+    scenarios += [ReplayScenario(path) for path in args.replay]
+    for scenario in scenarios:
+        # Each scenario starts from the default settings.
+        game.settings.__init__()
+        results[scenario.name] = run_scenario(
+            game, scenario, args.ticks, args.warmup)
+        print(f"{scenario.name}: "
+              f"{results[scenario.name]['ticks_per_sec']:.0f} ticks/sec",
+              file=sys.stderr)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'video_driver': os.environ.get('SDL_VIDEODRIVER'),
+            'startup': game.startup.report(),
+        },
+        'scenarios': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,157 @@
+from itertools import repeat
+
 import pygame
-from pygame.sprite import Sprite
  
-class Bullet(Sprite):
+class Bullet:
     """A class to manage bullets fired from the rocket"""
 
+    # Bullets are pooled and recycled, so keep them small.
+    __slots__ = ('settings', 'rect', 'y', 'prev_y', 'serial')
+
     def __init__(self, sb_game):
-        """Create a bullet object at the rocket's current position."""
-        super().__init__()
-        self.screen = sb_game.screen
+        """Create a bullet object, ready to be launched from the rocket."""
         self.settings = sb_game.settings
-        self.color = self.settings.bullet_color
 
-        # Create a bullet rect at (0, 0) and then set correct position.
+        # Create a bullet rect at (0, 0); it is moved when launched.
         self.rect = pygame.Rect(0, 0, self.settings.bullet_width,
             self.settings.bullet_height)
-        self.rect.midtop = sb_game.rocket.rect.midtop
-        
+
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
+        self.prev_y = self.y
 
-    def update(self):
+        # Number of the launch, so a recycled bullet is a new bullet.
+        self.serial = 0
+
+    def launch(self, midtop):
+        """Place the bullet at midtop, usually the rocket's nose."""
+        self.rect.midtop = midtop
+        self.y = self.prev_y = float(self.rect.y)
+
+    def update(self, dt):
         """Move the bullet up the screen."""
         # Update the decimal position of the bullet.
-        self.y -= self.settings.bullet_speed
+        self.prev_y = self.y
+        self.y -= self.settings.bullet_speed * dt
         # Update the rect position.
         self.rect.y = self.y
 
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
\ No newline at end of file
+
+class BulletPool:
+    """
+    A class to manage the bullets in flight.
+
+    Bullets are taken from a free list when fired and put back when
+    they leave the screen or hit a spaceship, so firing does not
+    allocate once the pool has grown to the number of bullets allowed.
+    """
+
+    def __init__(self, sb_game):
+        """Create the bullets allowed up front, all of them free."""
+        self.sb_game = sb_game
+        self.settings = sb_game.settings
+        self.rescale(sb_game)
+
+        # Bullets are solid, so every pixel of the mask is set.
+        self.mask = pygame.mask.Mask((self.settings.bullet_width,
+                                      self.settings.bullet_height), fill=True)
+
+        # Bullets launched so far; each gets the next serial number.
+        self.fired = 0
+
+        # Bullets in flight, in the order they were fired.
+        self.active = []
+        self.free = [Bullet(sb_game)
+                     for _ in range(self.settings.bullets_allowed)]
+
+    def rescale(self, sb_game):
+        """
+        Draw every bullet by blitting the same solid image, at the
+        render scale.
+        """
+        self.screen = sb_game.screen
+        self.render_scale = sb_game.render_scale
+        self.image = pygame.Surface(
+            (max(1, round(self.settings.bullet_width * self.render_scale)),
+             max(1, round(self.settings.bullet_height * self.render_scale))))
+        self.image.fill(self.settings.bullet_color)
+
+    def __len__(self):
+        """Return the number of bullets in flight."""
+        return len(self.active)
+
+    def __iter__(self):
+        """Iterate over the bullets in flight."""
+        return iter(self.active)
+
+    def fire(self, midtop):
+        """Launch a free bullet from midtop and return it."""
+        free = self.free
+        bullet = free.pop() if free else Bullet(self.sb_game)
+        bullet.launch(midtop)
+        bullet.serial = self.fired
+        self.fired += 1
+        self.active.append(bullet)
+        return bullet
+
+    def update(self, dt):
+        """Move every bullet in flight."""
+        for bullet in self.active:
+            bullet.update(dt)
+
+    def remove_off_screen(self):
+        """Free the bullets that have left the top of the screen."""
+        active = self.active
+        kept = 0
+        for bullet in active:
+            if bullet.rect.bottom > 0:
+                active[kept] = bullet
+                kept += 1
+            else:
+                self.free.append(bullet)
+        del active[kept:]
+
+    def release(self, spent):
+        """Free the bullets in spent, such as those that hit something."""
+        active = self.active
+        kept = 0
+        for bullet in active:
+            if bullet in spent:
+                self.free.append(bullet)
+            else:
+                active[kept] = bullet
+                kept += 1
+        del active[kept:]
+
+    def empty(self):
+        """Free every bullet in flight."""
+        self.free.extend(self.active)
+        self.active.clear()
+
+    def restore(self, xs, ys, prev_ys):
+        """Replace the bullets in flight with ones saved in a snapshot."""
+        self.empty()
+        free = self.free
+        for x, y, prev_y in zip(xs.tolist(), ys.tolist(), prev_ys.tolist()):
+            bullet = free.pop() if free else Bullet(self.sb_game)
+            bullet.rect.x = x
+            bullet.rect.y = y
+            bullet.y = y
+            bullet.prev_y = prev_y
+            bullet.serial = self.fired
+            self.fired += 1
+            self.active.append(bullet)
+
+    def draw(self, alpha=1.0):
+        """
+        Draw every bullet in flight between its previous and current
+        position in one batch, and return the rects they cover.
+        """
+        if not self.active:
+            return []
+        scale = self.render_scale
+        positions = [(bullet.rect.x * scale,
+                      (bullet.prev_y + (bullet.y - bullet.prev_y) * alpha)
+                      * scale)
+                     for bullet in self.active]
+        return self.screen.blits(zip(repeat(self.image), positions))
@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class SpatialHash:
+    """
+    A uniform grid that finds which spaceships are near a rect.
+
+    The fleet moves as one formation, so the grid is built in the
+    formation's own coordinates once per layout and queries are shifted
+    by how far the fleet has moved. Destroyed spaceships stay in their
+    cells and are skipped by the exact rect test.
+    """
+
+    def __init__(self, cell_size):
+        """Initialize an empty grid with square cells of cell_size pixels."""
+        self.cell_size = cell_size
+        self._layout = None
+        self._cells = {}
+        self._ships = np.empty(0, dtype=np.intp)
+
+        # Number of bullet/rocket-spaceship pairs given the exact test.
+        self.pairs_tested = 0
+
+    def sync(self, fleet):
+        """Rebuild the grid if the fleet was replaced by a new layout."""
+        if fleet.layout == self._layout:
+            return
+        self._layout = fleet.layout
+
+        # Each spaceship is stored in the cell of its top-left corner.
+        cells_x = np.floor_divide(fleet.x - fleet.offset_x,
+                                  self.cell_size).astype(np.int64)
+        cells_y = np.floor_divide(fleet.y - fleet.offset_y,
+                                  self.cell_size).astype(np.int64)
+        keys = (cells_x << 32) + cells_y
+
+        # Sort the spaceships by cell, so each cell is a slice of _ships.
+        self._ships = np.argsort(keys, kind='stable')
+        cell_keys, starts, counts = np.unique(
+            keys[self._ships], return_index=True, return_counts=True)
+        self._cells = dict(zip(cell_keys.tolist(),
+                               zip(starts.tolist(), (starts + counts).tolist())))
+
+    def query(self, fleet, rect, mask=None):
+        """
+        Return the indices of living spaceships that overlap rect.
+        If mask is given, the pixels of mask placed at rect must also
+        overlap a spaceship's opaque pixels.
+        """
+        cs = self.cell_size
+
+        # A spaceship can reach into rect from a cell up to one spaceship
+        # size to the left of or above it.
+        left = int((rect.left - fleet.width - fleet.offset_x) // cs)
+        right = int((rect.right - fleet.offset_x) // cs)
+        top = int((rect.top - fleet.height - fleet.offset_y) // cs)
+        bottom = int((rect.bottom - fleet.offset_y) // cs)
+
+        slices = []
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                span = self._cells.get((cell_x << 32) + cell_y)
+                if span:
+                    slices.append(self._ships[span[0]:span[1]])
+
+        if not slices:
+            return self._ships[:0]
+        candidates = slices[0] if len(slices) == 1 else np.concatenate(slices)
+        self.pairs_tested += len(candidates)
+        hits = fleet.collide_rect(rect, candidates)
+        if mask is not None and len(hits):
+            hits = fleet.collide_mask(rect, mask, hits)
+        return hits
+
+    def collide_bullets(self, bullets, fleet, pixel=False):
+        """
+        Destroy bullets and the spaceships they hit, and return a
+        dictionary of each bullet and the indices of spaceships it hit.
+        If pixel is True, hits are checked with the bullets' mask.
+        """
+        collisions = {}
+        if not fleet:
+            return collisions
+        mask = bullets.mask if pixel else None
+        for bullet in bullets:
+            hits = self.query(fleet, bullet.rect, mask)
+            if len(hits):
+                collisions[bullet] = hits
+                fleet.kill(hits)
+        if collisions:
+            bullets.release(collisions)
+        return collisions
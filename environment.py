@@ -0,0 +1,158 @@
+"""
+A step/reset interface for automated players. Games run headless and
+are never drawn; observations are NumPy arrays.
+"""
+import numpy as np
+
+from headless import use_dummy_drivers
+from space_battle import SpaceBattle
+
+# The game runs without a window.
+use_dummy_drivers()
+
+
+# An action is a bitwise OR of these flags; 0 does nothing.
+LEFT = 1
+RIGHT = 2
+UP = 4
+DOWN = 8
+FIRE = 16
+NUM_ACTIONS = 32
+
+
+class SpaceBattleEnv:
+    """
+    A class to play one game of Space Battle through step and reset.
+
+    The observation is a float32 vector, with positions divided by the
+    screen size:
+        rocket x, rocket y, rockets left, level,
+        x, y and alive of every spaceship in the formation,
+        x and y of every bullet that can be in flight (-1 if unused).
+    """
+
+    def __init__(self, frame_skip=1):
+        """Create a headless game that runs frame_skip ticks per step."""
+        self.game = SpaceBattle(headless=True)
+        self.frame_skip = frame_skip
+        self.dt = self.game.clock.dt
+
+        settings = self.game.settings
+        self._width = float(settings.screen_width)
+        self._height = float(settings.screen_height)
+
+        # Every formation has the same number of spaceships.
+        self.num_spaceships = len(self.game.spaceships.x)
+        self.observation_size = (4 + 3 * self.num_spaceships
+                                 + 2 * settings.bullets_allowed)
+        self.reset()
+
+    def reset(self):
+        """Start a new game and return its first observation."""
+        game = self.game
+        rocket = game.rocket
+        rocket.moving_right = rocket.moving_left = False
+        rocket.moving_up = rocket.moving_down = False
+        game._start_new_game()
+        return self.observe()
+
+    def step(self, action):
+        """
+        Hold the keys in action for frame_skip ticks, and return the
+        observation, the points scored, whether the game is over and
+        a dictionary of extra information.
+        """
+        reward, done, info = self.advance(action)
+        return self.observe(), reward, done, info
+
+    def advance(self, action):
+        """
+        Like step, but return only the points scored, whether the
+        game is over and the extra information.
+        """
+        game = self.game
+        stats = game.stats
+        rocket = game.rocket
+        rocket.moving_left = bool(action & LEFT)
+        rocket.moving_right = bool(action & RIGHT)
+        rocket.moving_up = bool(action & UP)
+        rocket.moving_down = bool(action & DOWN)
+        if action & FIRE:
+            game._fire_bullet()
+
+        score = stats.score
+        for _ in range(self.frame_skip):
+            game._update_positions(self.dt)
+
+        # Nothing the player does matters during a pause, so skip it.
+        while stats.game_active and stats.state != stats.PLAYING:
+            game._update_positions(self.dt)
+
+        info = {'level': stats.level, 'rockets_left': stats.rockets_left}
+        return stats.score - score, not stats.game_active, info
+
+    def observe(self, out=None):
+        """Return the current observation, written to out if given."""
+        if out is None:
+            out = np.empty(self.observation_size, dtype=np.float32)
+        game = self.game
+        width = self._width
+        height = self._height
+        fleet = game.spaceships
+        count = len(fleet.x)
+
+        out[0] = game.rocket.x / width
+        out[1] = game.rocket.y / height
+        out[2] = game.stats.rockets_left
+        out[3] = game.stats.level
+        out[4:4 + count] = fleet.x / width
+        out[4 + count:4 + 2 * count] = fleet.y / height
+        out[4 + 2 * count:4 + 3 * count] = fleet.alive
+
+        bullets = out[4 + 3 * count:].reshape(-1, 2)
+        bullets.fill(-1.0)
+        for row, bullet in zip(bullets, game.bullets):
+            row[0] = bullet.rect.x / width
+            row[1] = bullet.y / height
+        return out
+
+
+class VectorEnv:
+    """
+    A class to step many games at once. Games that end are reset
+    straight away, and their last observation is replaced by the
+    first one of the new game.
+    """
+
+    def __init__(self, num_envs, frame_skip=1):
+        """Create num_envs games."""
+        self.envs = [SpaceBattleEnv(frame_skip) for _ in range(num_envs)]
+        self.num_envs = num_envs
+        self.observation_size = self.envs[0].observation_size
+
+        self._observations = np.empty((num_envs, self.observation_size),
+                                      dtype=np.float32)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._dones = np.zeros(num_envs, dtype=bool)
+
+    def reset(self):
+        """Start a new game in every env and return the observations."""
+        for env, out in zip(self.envs, self._observations):
+            env.reset()
+            env.observe(out)
+        return self._observations.copy()
+
+    def step(self, actions):
+        """
+        Apply one action to each game, and return arrays of the
+        observations, rewards and done flags.
+        """
+        observations = self._observations
+        rewards = self._rewards
+        dones = self._dones
+        for i, (env, action) in enumerate(zip(self.envs, actions.tolist())):
+            rewards[i], dones[i], _ = env.advance(action)
+            if dones[i]:
+                env.reset()
+            env.observe(observations[i])
+        return observations.copy(), rewards.copy(), dones.copy()
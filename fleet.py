@@ -0,0 +1,214 @@
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+
+class Fleet:
+    """
+    A class to manage the whole fleet of spaceships.
+    Ship positions are kept in NumPy arrays so the formation moves,
+    drops and bounces in one vectorized step.
+    """
+
+    def __init__(self, sb_game):
+        """Initialize an empty fleet."""
+        self.settings = sb_game.settings
+
+        self.rescale(sb_game)
+        self.width, self.height = sb_game.sprites.size('spaceship')
+
+        # Every spaceship shares one collision mask.
+        self.mask = sb_game.assets.mask('spaceship')
+
+        # Counts the formations created, so other parts of the game can
+        # tell when the fleet has been replaced.
+        self.generation = 0
+        self.x, self.y = np.empty(0), np.empty(0)
+        self.prev_x, self.prev_y = np.empty(0), np.empty(0)
+        self.alive = np.empty(0, dtype=bool)
+        self.empty()
+
+    def rescale(self, sb_game):
+        """
+        Draw every spaceship from the same part of the sprite sheet,
+        at the render scale.
+        """
+        self.sheet = sb_game.draw_sprites.surface
+        self.area = sb_game.draw_sprites.region('spaceship')
+        self.render_scale = sb_game.render_scale
+
+    def empty(self):
+        """Get rid of every spaceship."""
+        self.populate(np.empty(0), np.empty(0))
+
+    def populate(self, xs, ys, layout=None):
+        """
+        Replace the fleet with spaceships at the given positions.
+        Fleets created with the same layout key share one layout, so
+        their collision grid is built only once.
+        """
+        count = len(xs)
+        if count == len(self.x):
+            # Same size as before: copy into the existing arrays.
+            self.x[:] = xs
+            self.y[:] = ys
+            self.alive.fill(True)
+        else:
+            self.x = np.array(xs, dtype=np.float64)
+            self.y = np.array(ys, dtype=np.float64)
+
+            # Positions at the previous tick, used to interpolate drawing.
+            self.prev_x = np.empty_like(self.x)
+            self.prev_y = np.empty_like(self.y)
+
+            # Spaceships are never removed from the arrays, only marked dead.
+            self.alive = np.ones(count, dtype=bool)
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.count = count
+
+        # How far the formation has moved since it was created.
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.generation += 1
+        self.layout = self.generation if layout is None else layout
+        if layout is None:
+            self._find_extremes()
+
+    def spawn(self, formation):
+        """Replace the fleet with a copy of a precomputed formation."""
+        self.populate(formation.x, formation.y, formation)
+        if formation.extremes is None:
+            self._left = self._right = self._top = self._bottom = None
+        else:
+            self._left, self._right, self._top, self._bottom = formation.extremes
+
+    def restore(self, xs, ys, prev_xs, prev_ys, alive, offset_x, offset_y):
+        """Replace the fleet with one saved in a snapshot."""
+        self.populate(xs, ys)
+        self.prev_x[:] = prev_xs
+        self.prev_y[:] = prev_ys
+        self.alive[:] = alive
+        self.count = int(np.count_nonzero(self.alive))
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self._find_extremes()
+
+    def __len__(self):
+        """Return the number of spaceships still alive."""
+        return self.count
+
+    def kill(self, indices):
+        """Destroy the spaceships at the given indices."""
+        self.alive[indices] = False
+        self.count = int(np.count_nonzero(self.alive))
+        self._find_extremes()
+
+    def _find_extremes(self):
+        """
+        Remember which living spaceships are leftmost, rightmost and
+        lowest. The formation moves as one, so they stay the same
+        until a spaceship is destroyed.
+        """
+        if not self.count:
+            self._left = self._right = self._top = self._bottom = None
+            return
+        living = np.flatnonzero(self.alive)
+        self._left = living[np.argmin(self.x[living])]
+        self._right = living[np.argmax(self.x[living])]
+        self._top = living[np.argmin(self.y[living])]
+        self._bottom = living[np.argmax(self.y[living])]
+
+    def check_edges(self, screen_rect):
+        """Return True if any spaceship is at the edge of the screen."""
+        if not self.count:
+            return False
+        return (self.x[self._right] + self.width >= screen_rect.right
+                or self.x[self._left] <= 0)
+
+    def change_direction(self):
+        """Drop the entire fleet and change the fleet's direction."""
+        self.y += self.settings.fleet_drop_speed
+        self.offset_y += self.settings.fleet_drop_speed
+        self.settings.fleet_direction *= -1
+
+    def update(self, dt):
+        """Move the entire fleet right or left."""
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        step = self.settings.spaceship_speed * dt * self.settings.fleet_direction
+        self.x += step
+        self.offset_x += step
+
+    def check_bottom(self, screen_rect):
+        """Return True if any spaceship has reached the bottom of the screen."""
+        if not self.count:
+            return False
+        return self.y[self._bottom] + self.height >= screen_rect.bottom
+
+    def collide_rect(self, rect, indices=None):
+        """
+        Return the indices of living spaceships that overlap rect.
+        If indices is given, only those spaceships are tested.
+        """
+        if indices is None:
+            hits = (self.alive
+                    & (self.x < rect.right) & (self.x + self.width > rect.left)
+                    & (self.y < rect.bottom) & (self.y + self.height > rect.top))
+            return np.flatnonzero(hits)
+
+        x = self.x[indices]
+        y = self.y[indices]
+        hits = (self.alive[indices]
+                & (x < rect.right) & (x + self.width > rect.left)
+                & (y < rect.bottom) & (y + self.height > rect.top))
+        return indices[hits]
+
+    def collide_mask(self, rect, mask, indices):
+        """
+        Return the spaceships among indices whose opaque pixels overlap
+        mask placed at rect. The rects should already overlap.
+        """
+        overlap = self.mask.overlap
+        x = self.x[indices].astype(int).tolist()
+        y = self.y[indices].astype(int).tolist()
+        hits = [index for index, ship_x, ship_y in zip(indices.tolist(), x, y)
+                if overlap(mask, (rect.x - ship_x, rect.y - ship_y))]
+        return np.array(hits, dtype=indices.dtype)
+
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw every living spaceship between its last two positions
+        and return the rect that bounds them.
+        """
+        if not self.count:
+            return pygame.Rect(0, 0, 0, 0)
+
+        x = self.x[self.alive]
+        y = self.y[self.alive]
+        if alpha != 1.0:
+            prev_x = self.prev_x[self.alive]
+            prev_y = self.prev_y[self.alive]
+            x = prev_x + (x - prev_x) * alpha
+            y = prev_y + (y - prev_y) * alpha
+        scale = self.render_scale
+        if scale != 1.0:
+            x = x * scale
+            y = y * scale
+        screen.blits(zip(repeat(self.sheet), zip(x.tolist(), y.tolist()),
+                         repeat(self.area)),
+                     False)
+
+        # The formation moves as one, so the extreme spaceships bound it.
+        left = self._lerp(self.prev_x, self.x, self._left, alpha)
+        right = self._lerp(self.prev_x, self.x, self._right, alpha)
+        top = self._lerp(self.prev_y, self.y, self._top, alpha)
+        bottom = self._lerp(self.prev_y, self.y, self._bottom, alpha)
+        return pygame.Rect(int(left * scale), int(top * scale),
+                           int((right - left) * scale) + self.area.width + 1,
+                           int((bottom - top) * scale) + self.area.height + 1)
+
+    def _lerp(self, prev, current, index, alpha):
+        """Return a spaceship's coordinate alpha of the way between ticks."""
+        return prev[index] + (current[index] - prev[index]) * alpha
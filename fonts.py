@@ -0,0 +1,69 @@
+import json
+import os
+
+import pygame.font
+
+
+# Fonts shipped with the game, wherever it is started from.
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'fonts')
+
+
+class FontCache:
+    """
+    A class to open fonts by name without scanning the system's fonts.
+
+    A font is looked for as fonts/<name>.ttf first. Otherwise its file
+    is found once with pygame.font.match_font, which scans every font
+    on the system, and the result is saved to cache_path so later
+    starts skip the scan. A name of None is pygame's bundled font.
+    """
+
+    def __init__(self, cache_path, font_dir=FONT_DIR):
+        """Initialize the cache from cache_path, if it exists."""
+        self.cache_path = cache_path
+        self.font_dir = font_dir
+        self._paths = {}
+        if cache_path:
+            try:
+                with open(cache_path) as f:
+                    self._paths = json.load(f)
+            except (OSError, ValueError):
+                self._paths = {}
+
+    def font(self, name, size):
+        """Return a Font of the named family at size points."""
+        return pygame.font.Font(self.path(name), size)
+
+    def path(self, name):
+        """
+        Return the file of the named font, or None for pygame's
+        bundled font if there is no such font.
+        """
+        if name is None:
+            return None
+
+        bundled = os.path.join(self.font_dir, f"{name}.ttf")
+        if os.path.exists(bundled):
+            return bundled
+
+        path = self._paths.get(name)
+        if path is not None and (path == '' or os.path.exists(path)):
+            return path or None
+
+        # Not seen before, or the font has moved: scan once and remember.
+        path = pygame.font.match_font(name) or ''
+        self._paths[name] = path
+        self._save()
+        return path or None
+
+    def _save(self):
+        """Write the found font files to the cache file."""
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump(self._paths, f, indent=2)
+        except OSError:
+            # A read-only install just scans again next time.
+            pass
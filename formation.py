@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+class Formation:
+    """
+    Starting positions of a fleet. A formation is computed once and
+    shared, read-only, by every fleet created from it.
+    """
+
+    def __init__(self, xs, ys):
+        """Store the positions and find the extreme spaceships."""
+        self.x = np.array(xs, dtype=np.float64)
+        self.y = np.array(ys, dtype=np.float64)
+        self.x.setflags(write=False)
+        self.y.setflags(write=False)
+
+        # Indices of the leftmost, rightmost, top and bottom spaceships.
+        self.extremes = None
+        if len(self.x):
+            self.extremes = (np.argmin(self.x), np.argmax(self.x),
+                             np.argmin(self.y), np.argmax(self.y))
+
+    def __len__(self):
+        """Return the number of spaceships in the formation."""
+        return len(self.x)
+
+
+@lru_cache(maxsize=None)
+def grid_formation(screen_width, screen_height, spaceship_width,
+                   spaceship_height, rocket_height):
+    """Return the grid of spaceships that fits the screen."""
+    # Spacing between each spaceship is equal to one spaceship width.
+    # Calculate the number of spaceships in a row
+    # (2 * spaceship_width) creates margins on either side of a screen
+    available_space_x = screen_width - (2 * spaceship_width)
+    number_spaceships_x = available_space_x // (2 * spaceship_width)
+
+    # Determine the number of rows of spaceships that fit on the screen.
+    available_space_y = (screen_height -
+                            (18 * spaceship_height) - rocket_height)
+    number_rows = available_space_y // (2 * spaceship_height)
+
+    columns, rows = np.meshgrid(np.arange(number_spaceships_x),
+                                np.arange(number_rows))
+    return Formation(
+        spaceship_width + 2 * spaceship_width * columns.ravel(),
+        3.5 * spaceship_height + 2 * spaceship_height * rows.ravel())
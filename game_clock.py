@@ -0,0 +1,50 @@
+import pygame
+
+
+class GameClock:
+    """
+    A fixed-timestep clock that decouples the simulation from the
+    frame rate.
+    """
+
+    def __init__(self, settings):
+        """Initialize the clock from the game's settings."""
+        self.settings = settings
+
+        # Length of one simulation tick in seconds.
+        self.dt = 1.0 / settings.tick_rate
+
+        # Time that has passed but is not yet simulated.
+        self.accumulator = 0.0
+
+        # How far the rendered frame is between the last two ticks.
+        self.alpha = 0.0
+
+        # Total number of ticks simulated so far.
+        self.ticks = 0
+
+        # With vsync the display paces the frames, so do not cap them.
+        self.frame_rate = 0 if settings.vsync else settings.max_frame_rate
+
+        self.clock = pygame.time.Clock()
+
+    def tick(self):
+        """
+        Wait for the next frame (if frames are capped) and return
+        the number of simulation ticks to run before rendering it.
+        """
+        elapsed = self.clock.tick(self.frame_rate) / 1000.0
+
+        # After a long stall run a bounded number of ticks instead of
+        # trying to catch up all at once.
+        self.accumulator += min(elapsed, self.settings.max_frame_time)
+
+        ticks = int(self.accumulator / self.dt)
+        self.accumulator -= ticks * self.dt
+        self.alpha = self.accumulator / self.dt
+        self.ticks += ticks
+        return ticks
+
+    def get_fps(self):
+        """Return the averaged rendered frame rate."""
+        return self.clock.get_fps()
@@ -1,5 +1,12 @@
 class GameStats:
     """Track statistics for Alien Invasion."""
+
+    # States of the game. The rocket-destroyed and level-transition
+    # states are pauses that end when their timer runs out.
+    PLAYING = 'playing'
+    ROCKET_DESTROYED = 'rocket_destroyed'
+    LEVEL_TRANSITION = 'level_transition'
+    GAME_OVER = 'game_over'
     
     def __init__(self, sb_game):
         """Initialize statistics."""
@@ -7,7 +14,7 @@ class GameStats:
         self.reset_stats()
 
         # Start game in an inactive state.
-        self.game_active = False
+        self.set_state(self.GAME_OVER)
 
         # High score should never be reset.
         self.high_score = 0
@@ -16,4 +23,17 @@ class GameStats:
         """Initialize statistics that can change during the game."""
         self.rockets_left = self.settings.rocket_limit
         self.score = 0
-        self.level = 1
\ No newline at end of file
+        self.level = 1
+
+        # Seconds of play spent on the current level.
+        self.level_time = 0.0
+
+    def set_state(self, state, duration=0.0):
+        """Enter a state that lasts duration seconds of game time."""
+        self.state = state
+        self.state_time_left = duration
+
+    @property
+    def game_active(self):
+        """Return True while a game is in progress, including its pauses."""
+        return self.state != self.GAME_OVER
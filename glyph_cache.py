@@ -0,0 +1,70 @@
+import pygame
+
+
+class GlyphCache:
+    """
+    A class to render each character of one font and colour once.
+    Digits and separators are rendered up front.
+    """
+
+    def __init__(self, font, color, bg_color, preload="0123456789,.-"):
+        """Initialize the cache and render the preloaded characters."""
+        self.font = font
+        self.color = color
+        self.bg_color = bg_color
+        self.height = font.get_height()
+        self._glyphs = {}
+        for char in preload:
+            self.glyph(char)
+
+    def glyph(self, char):
+        """Return the rendered image of one character."""
+        image = self._glyphs.get(char)
+        if image is None:
+            image = self.font.render(char, True, self.color, self.bg_color)
+            self._glyphs[char] = image
+        return image
+
+
+class GlyphText:
+    """
+    A class to build a line of text from cached glyphs.
+    When the text changes, only the characters that changed are drawn
+    again, as long as the rest of the line stays in place.
+    """
+
+    def __init__(self, glyphs):
+        """Initialize an empty line drawn with glyphs, a GlyphCache."""
+        self.glyphs = glyphs
+        self.text = None
+        self.image = None
+        self._widths = []
+
+    def render(self, text):
+        """Return an image of text, reusing the last image if it can."""
+        if text == self.text:
+            return self.image
+
+        glyph = self.glyphs.glyph
+        images = [glyph(char) for char in text]
+        widths = [image.get_width() for image in images]
+
+        if widths != self._widths:
+            # The layout changed, so build the whole line again.
+            self.image = pygame.Surface((max(sum(widths), 1),
+                                         self.glyphs.height))
+            x = 0
+            for image, width in zip(images, widths):
+                self.image.blit(image, (x, 0))
+                x += width
+        else:
+            x = 0
+            for old, new, image, width in zip(self.text, text, images,
+                                              widths):
+                if old != new:
+                    self.image.blit(image, (x, 0))
+                x += width
+
+        self.text = text
+        self._widths = widths
+        return self.image
@@ -0,0 +1,123 @@
+from time import perf_counter
+
+
+class QualityGovernor:
+    """
+    A class to keep frames within a time budget by stepping optional
+    drawing work down when frames run long, and back up when there
+    is headroom again.
+
+    Each level gives up a little more than the one before it:
+    the HUD text is refreshed less often, then the screen is no
+    longer filled in full, then the game is drawn at a lower scale.
+    Levels the settings already draw at, such as dirty rects when
+    render_mode is 'dirty', are passed over.
+    """
+
+    FULL, THROTTLE_HUD, DIRTY_RECTS, LOW_SCALE = range(4)
+    LEVELS = ('full', 'throttle_hud', 'dirty_rects', 'low_scale')
+
+    def __init__(self, settings):
+        """Initialize the governor at full quality."""
+        self.settings = settings
+        self.budget = settings.frame_budget
+        if self.budget is None:
+            self.budget = 1.0 / (settings.max_frame_rate or settings.tick_rate)
+        self.level = self.FULL
+
+        # The levels that change something under these settings.
+        skipped = set()
+        if settings.hud_refresh_interval <= 1:
+            skipped.add(self.THROTTLE_HUD)
+        if settings.render_mode == 'dirty':
+            skipped.add(self.DIRTY_RECTS)
+        self.levels = [level for level in range(len(self.LEVELS))
+                       if level not in skipped]
+
+        # Frame cost, smoothed so one slow frame does not change the
+        # quality on its own.
+        self.frame_time = 0.0
+        self.smoothing = 0.1
+
+        # Frames in a row that were over budget, or well under it.
+        # Stepping up waits much longer, so the quality does not
+        # swing back and forth.
+        self.step_down_after = 20
+        self.step_up_after = 180
+        self.headroom = 0.6
+        self._over = 0
+        self._under = 0
+
+        # A level that was stepped up to and had to be left again
+        # within probe_frames is waited for backoff times longer next
+        # time, up to max_step_up_after frames. Each level keeps its
+        # own wait, which resets once the level holds.
+        self.probe_frames = 600
+        self.backoff = 4
+        self.max_step_up_after = 64 * self.step_up_after
+        self._step_up_waits = [self.step_up_after] * len(self.LEVELS)
+        self._probe = None
+        self._frames = 0
+
+        self._started = None
+
+    @property
+    def level_name(self):
+        """Return the name of the current quality level."""
+        return self.LEVELS[self.level]
+
+    def begin_frame(self):
+        """Start timing a frame's work."""
+        self._started = perf_counter()
+
+    def end_frame(self):
+        """
+        Finish timing a frame, and return the new quality level if it
+        changed, otherwise None.
+        """
+        if self._started is None:
+            return None
+        cost = perf_counter() - self._started
+        self._started = None
+        self.frame_time += (cost - self.frame_time) * self.smoothing
+        self._frames += 1
+
+        # A level stepped up to that has held long enough is good.
+        if (self._probe is not None
+                and self._frames - self._probe[1] > self.probe_frames):
+            self._step_up_waits[self._probe[0]] = self.step_up_after
+            self._probe = None
+
+        if self.frame_time > self.budget:
+            self._over += 1
+            self._under = 0
+            if (self._over >= self.step_down_after
+                    and self.level < self.levels[-1]):
+                if self._probe is not None and self._probe[0] == self.level:
+                    # The level just stepped up to could not hold.
+                    waits = self._step_up_waits
+                    waits[self.level] = min(waits[self.level] * self.backoff,
+                                            self.max_step_up_after)
+                self._probe = None
+                return self._set_level(self._next_level(1))
+        elif self.frame_time < self.budget * self.headroom:
+            self._under += 1
+            self._over = 0
+            if self.level > self.FULL:
+                level = self._next_level(-1)
+                if self._under >= self._step_up_waits[level]:
+                    self._probe = (level, self._frames)
+                    return self._set_level(level)
+        else:
+            self._over = self._under = 0
+        return None
+
+    def _next_level(self, step):
+        """Return the level step places down (or up, if negative)."""
+        return self.levels[self.levels.index(self.level) + step]
+
+    def _set_level(self, level):
+        """Change the quality level and start counting frames afresh."""
+        self.level = level
+        self._over = self._under = 0
+        return level
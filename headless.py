@@ -0,0 +1,27 @@
+"""
+Helpers shared by the scripts that run the game without a window.
+Import this before pygame: it keeps pygame's greeting off stdout, so
+the scripts' output stays machine-readable.
+"""
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import numpy as np
+
+
+def use_dummy_drivers():
+    """
+    Let the game run without a window or sound, unless SDL has been
+    told to use other drivers. Call this before the game is created.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+def summarize(samples):
+    """Return p50/p95/p99/mean of a list of durations, in milliseconds."""
+    ms = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {'p50_ms': float(p50), 'p95_ms': float(p95),
+            'p99_ms': float(p99), 'mean_ms': float(ms.mean())}
@@ -0,0 +1,167 @@
+import random
+import struct
+
+import pygame
+
+
+# File layout: a header, then one record per input. Each record is the
+# number of ticks since the previous record as a varint, one code byte
+# and, for clicks, the click position as two varints. A record with the
+# END code closes the file and holds the total number of ticks.
+MAGIC = b'SBIN'
+VERSION = 1
+_HEADER = struct.Struct('<4sBQH')
+
+KEYDOWN, KEYUP, CLICK, END = range(4)
+
+# Keys that change the game. The low bits of a key code byte index
+# this tuple.
+KEYS = (pygame.K_RIGHT, pygame.K_LEFT, pygame.K_UP, pygame.K_DOWN,
+        pygame.K_SPACE)
+_KEY_INDEX = {key: i for i, key in enumerate(KEYS)}
+
+
+def _encode_varint(value):
+    """Return value as a little-endian base-128 varint."""
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(f):
+    """Read a varint from f, or return None at the end of the file."""
+    value = shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        value |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+class InputRecorder:
+    """A class to write the player's inputs to a file as they happen."""
+
+    def __init__(self, path, seed, tick_rate):
+        """Open path and write the header."""
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, seed, tick_rate))
+        self._last_tick = 0
+
+    def key_down(self, tick, key):
+        """Record a key press before the given tick."""
+        if key in _KEY_INDEX:
+            self._write(tick, KEYDOWN << 4 | _KEY_INDEX[key])
+
+    def key_up(self, tick, key):
+        """Record a key release before the given tick."""
+        if key in _KEY_INDEX:
+            self._write(tick, KEYUP << 4 | _KEY_INDEX[key])
+
+    def click(self, tick, pos):
+        """Record a mouse click at pos before the given tick."""
+        self._write(tick, CLICK << 4, *pos)
+
+    def close(self, tick):
+        """Record that the game ran for tick ticks, and close the file."""
+        if self._file.closed:
+            return
+        self._write(tick, END << 4)
+        self._file.close()
+
+    def _write(self, tick, code, *values):
+        """Write one record, its tick stored as a delta."""
+        record = _encode_varint(tick - self._last_tick) + bytes((code,))
+        for value in values:
+            record += _encode_varint(max(int(value), 0))
+        self._file.write(record)
+        self._last_tick = tick
+
+
+class InputReader:
+    """A class to read back a file written by InputRecorder."""
+
+    def __init__(self, path):
+        """Open path and read the header."""
+        self.path = path
+        self._file = open(path, 'rb')
+        magic, version, self.seed, self.tick_rate = _HEADER.unpack(
+            self._file.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a Space Battle input recording")
+
+        # Total number of ticks, known once the END record is read.
+        self.end_tick = None
+
+    def __iter__(self):
+        """
+        Yield (tick, kind, value) for each input, where value is the
+        pygame key code or the click position.
+        """
+        f = self._file
+        tick = 0
+        while True:
+            delta = _read_varint(f)
+            if delta is None:
+                # A game that did not exit cleanly has no END record.
+                break
+            tick += delta
+            code = f.read(1)[0]
+            kind = code >> 4
+            if kind == END:
+                self.end_tick = tick
+                break
+            if kind == CLICK:
+                yield tick, kind, (_read_varint(f), _read_varint(f))
+            else:
+                yield tick, kind, KEYS[code & 0x0f]
+        f.close()
+
+
+class InputReplay:
+    """A class to feed recorded inputs back into a game, tick by tick."""
+
+    def __init__(self, sb_game, reader):
+        """Prepare sb_game to replay the inputs read by reader."""
+        self.sb_game = sb_game
+        self.reader = reader
+        self._inputs = iter(reader)
+        self._next = next(self._inputs, None)
+
+        # The recording starts from a fresh game, before Start is
+        # clicked, with no keys held down.
+        sb_game.stats.set_state(sb_game.stats.GAME_OVER)
+        sb_game.stats.high_score = 0
+        sb_game.scoreboard.set_high_score()
+        rocket = sb_game.rocket
+        rocket.moving_right = rocket.moving_left = False
+        rocket.moving_up = rocket.moving_down = False
+
+        sb_game.seed = reader.seed
+        random.seed(reader.seed)
+
+    @property
+    def finished(self):
+        """Return True once every input has been applied."""
+        return self._next is None
+
+    def apply(self, tick):
+        """Apply the inputs recorded before the given tick."""
+        game = self.sb_game
+        while self._next is not None and self._next[0] <= tick:
+            _, kind, value = self._next
+            if kind == KEYDOWN:
+                game._check_keydown_events(
+                    pygame.event.Event(pygame.KEYDOWN, key=value))
+            elif kind == KEYUP:
+                game._check_keyup_events(
+                    pygame.event.Event(pygame.KEYUP, key=value))
+            else:
+                game._press_play_button(value)
+            self._next = next(self._inputs, None)
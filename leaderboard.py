@@ -0,0 +1,156 @@
+import os
+import queue
+import struct
+import threading
+import time
+
+
+class Leaderboard:
+    """
+    A class to keep the best scores across games.
+
+    Every finished game is appended to a log file. An index file holds
+    the best scores and how much of the log they cover, so loading
+    only reads the index and the part of the log written after it.
+    All disk writes happen on a background thread fed by a bounded
+    queue, so recording a game never waits for the disk.
+    """
+
+    # Each game is stored as its score, level and the time it ended.
+    RECORD = struct.Struct('<qId')
+
+    # The index starts with the log size it covers and a record count.
+    INDEX_HEADER = struct.Struct('<QI')
+
+    def __init__(self, path, top_n=10, queue_size=256, index_every=64):
+        """
+        Load the best top_n scores from path (the log) and path.idx
+        (the index), and start the writer thread.
+        """
+        self.path = path
+        self.index_path = path + '.idx'
+        self.top_n = top_n
+
+        # Write the index again after this many new games.
+        self.index_every = index_every
+
+        # Games that could not be queued because the writer fell behind.
+        self.dropped = 0
+
+        self.top = []
+        self._load()
+
+        # The best scores that are already in the log, kept by the
+        # writer thread for the index.
+        self._written_top = list(self.top)
+
+        self._queue = queue.Queue(queue_size)
+        self._writer = threading.Thread(target=self._write_loop,
+                                        name='leaderboard-writer',
+                                        daemon=True)
+        self._writer.start()
+
+    def high_score(self):
+        """Return the best score recorded, or 0."""
+        return self.top[0][0] if self.top else 0
+
+    def record(self, score, level):
+        """Add a finished game. Never blocks."""
+        entry = (score, level, time.time())
+        self._insert(self.top, entry)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Write every queued game to disk and stop the writer."""
+        self._queue.put(None)
+        self._writer.join()
+
+    def _insert(self, top, entry):
+        """Add entry to the best scores in top if it makes the cut."""
+        if len(top) < self.top_n or entry[0] > top[-1][0]:
+            top.append(entry)
+            top.sort(key=lambda e: e[0], reverse=True)
+            del top[self.top_n:]
+
+    def _load(self):
+        """Read the index, then the log written since it was saved."""
+        covered = 0
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = f.read()
+            covered, count = self.INDEX_HEADER.unpack_from(data)
+            for i in range(count):
+                self._insert(self.top, self.RECORD.unpack_from(
+                    data, self.INDEX_HEADER.size + i * self.RECORD.size))
+        except (OSError, struct.error):
+            # Without a usable index, read the whole log.
+            self.top = []
+            covered = 0
+
+        try:
+            with open(self.path, 'rb') as f:
+                if covered > f.seek(0, os.SEEK_END):
+                    # The log was cut short after the index was saved,
+                    # so the index no longer matches it.
+                    self.top = []
+                    covered = 0
+                f.seek(covered)
+                data = f.read()
+        except OSError:
+            # Without a log, the index describes games that are gone.
+            self.top = []
+            covered = 0
+            data = b''
+        # A partly written last record is ignored.
+        usable = len(data) - len(data) % self.RECORD.size
+        for entry in self.RECORD.iter_unpack(data[:usable]):
+            self._insert(self.top, entry)
+        self._log_size = covered + usable
+
+    def _write_loop(self):
+        """Append queued games to the log, in batches, on a thread."""
+        unindexed = 0
+        with open(self.path, 'ab') as log:
+            # Drop a partly written record left by a crash.
+            log.truncate(self._log_size)
+            running = True
+            while running:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    running = False
+                    batch = [entry for entry in batch if entry is not None]
+                if not batch:
+                    continue
+
+                log.write(b''.join(self.RECORD.pack(*entry)
+                                   for entry in batch))
+                log.flush()
+                os.fsync(log.fileno())
+                self._log_size += len(batch) * self.RECORD.size
+                for entry in batch:
+                    self._insert(self._written_top, entry)
+
+                unindexed += len(batch)
+                if unindexed >= self.index_every or not running:
+                    self._write_index()
+                    unindexed = 0
+
+    def _write_index(self):
+        """Replace the index with the current best scores."""
+        top = self._written_top
+        data = (self.INDEX_HEADER.pack(self._log_size, len(top))
+                + b''.join(self.RECORD.pack(*entry) for entry in top))
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.index_path)
@@ -0,0 +1,96 @@
+import pygame
+import pygame.font
+
+
+class PerfOverlay:
+    """A class to draw frame-time graphs and counters from the profiler."""
+
+    # Colors of the phases in the stacked frame-time graph.
+    PHASE_COLORS = {
+        'events': (120, 120, 120),
+        'clock': (60, 60, 90),
+        'rocket': (80, 200, 255),
+        'bullets': (255, 255, 255),
+        'fleet': (120, 255, 120),
+        'collisions': (255, 80, 80),
+        'render': (255, 200, 60),
+        'scoreboard': (255, 120, 220),
+        'flip': (180, 120, 255),
+    }
+
+    def __init__(self, sb_game):
+        """Initialize the overlay in the bottom left corner of the screen."""
+        self.screen = sb_game.screen
+        self.screen_rect = self.screen.get_rect()
+        self.profiler = sb_game.profiler
+
+        self.visible = False
+        self.bg_color = (0, 0, 0)
+        self.text_color = (255, 255, 255)
+        self.font = sb_game.fonts.font(None, 20)
+
+        # The graph shows one column per frame, scaled so the height
+        # of the graph is graph_ms milliseconds.
+        self.graph_ms = 33.3
+        self.rect = pygame.Rect(0, 0, 300, 160)
+        self.rect.bottomleft = (10, self.screen_rect.bottom - 10)
+        self.graph_rect = pygame.Rect(self.rect.left + 5, self.rect.top + 5,
+                                      self.rect.width - 10, 90)
+
+        # Text is rendered again only every few frames.
+        self.text_interval = 15
+        self._text_images = []
+
+    def toggle(self):
+        """Show or hide the overlay, profiling only while it is shown."""
+        self.visible = not self.visible
+        self.profiler.set_enabled(self.visible)
+
+    def draw(self):
+        """Draw the overlay and return the rect it covers."""
+        self.screen.fill(self.bg_color, self.rect)
+        times, counts = self.profiler.history()
+        if len(times):
+            self._draw_graph(times)
+            if (not self._text_images
+                    or self.profiler.frames % self.text_interval == 0):
+                self._prep_text(times, counts)
+
+        y = self.graph_rect.bottom + 5
+        for image in self._text_images:
+            self.screen.blit(image, (self.graph_rect.left, y))
+            y += image.get_height()
+        return self.rect.copy()
+
+    def _draw_graph(self, times):
+        """Draw the newest frames as stacked columns of phase times."""
+        graph = self.graph_rect
+        scale = graph.height / (self.graph_ms / 1000.0)
+        colors = [self.PHASE_COLORS[phase] for phase in self.profiler.PHASES]
+        recent = times[-graph.width:]
+        x = graph.right - len(recent)
+        for frame in recent.tolist():
+            bottom = graph.bottom
+            for color, seconds in zip(colors, frame):
+                height = min(int(seconds * scale), bottom - graph.top)
+                if height > 0:
+                    self.screen.fill(color, (x, bottom - height, 1, height))
+                    bottom -= height
+            x += 1
+
+    def _prep_text(self, times, counts):
+        """Turn the average frame time and latest counters into images."""
+        total_ms = times.sum(axis=1).mean() * 1000.0
+        # Time spent waiting for the frame cap is not work.
+        clock = self.profiler.PHASES.index('clock')
+        busy_ms = (times.sum(axis=1) - times[:, clock]).mean() * 1000.0
+        latest = dict(zip(self.profiler.COUNTERS, counts[-1].tolist()))
+        lines = [
+            f"frame {total_ms:.2f} ms  (busy {busy_ms:.2f} ms)",
+            f"spaceships {latest['spaceships']}  bullets {latest['bullets']}",
+            f"ticks {latest['ticks']}  "
+            f"collision pairs {latest['collision_pairs']}",
+        ]
+        self._text_images = [self.font.render(line, True, self.text_color,
+                                              self.bg_color)
+                             for line in lines]
@@ -8,14 +8,19 @@ class PlayButton:
         self.screen_rect = self.screen.get_rect()
         
         # Set the dimensions and properties of the button.
-        self.width, self.height = 200, 50
+        scale = sb_game.render_scale
+        self.width, self.height = round(200 * scale), round(50 * scale)
         self.button_color = (0, 255, 0)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = sb_game.fonts.font(None, round(48 * scale))
         
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
         self.rect.center = self.screen_rect.center
+
+        # The same rect in play-field coordinates, which clicks use.
+        self.field_rect = pygame.Rect(0, 0, 200, 50)
+        self.field_rect.center = sb_game.field.center
         
         # The button message needs to be prepped only once.
         self._prep_msg(text)
@@ -33,4 +38,5 @@ class PlayButton:
     def draw_button(self):
         # Draw blank button and then draw message.
         self.screen.fill(self.button_color, self.rect)
-        self.screen.blit(self.msg_image, self.msg_image_rect)
\ No newline at end of file
+        self.screen.blit(self.msg_image, self.msg_image_rect)
+        return self.rect.copy()
@@ -0,0 +1,121 @@
+import csv
+import json
+from time import perf_counter
+
+import numpy as np
+
+
+def _skip(phase):
+    """Stand in for Profiler.mark while profiling is off."""
+
+
+class StartupTimer:
+    """A class to time the steps of starting the game."""
+
+    def __init__(self):
+        """Start timing."""
+        self.start = self._last = perf_counter()
+
+        # Seconds taken by each step, in the order they finished.
+        self.steps = {}
+
+    def mark(self, step):
+        """Record the time since the last mark as step."""
+        now = perf_counter()
+        self.steps[step] = now - self._last
+        self._last = now
+
+    def report(self):
+        """Return the step times and the total, in milliseconds."""
+        report = {f'{step}_ms': seconds * 1000.0
+                  for step, seconds in self.steps.items()}
+        report['total_ms'] = (self._last - self.start) * 1000.0
+        return report
+
+
+class Profiler:
+    """
+    A class to time each phase of a frame.
+
+    Durations and counters are kept in a ring buffer of the last
+    frames. While the profiler is off, mark is replaced by a function
+    that does nothing, so the hooks cost about one call each.
+    """
+
+    # Phases of a frame, in the order run_game goes through them.
+    PHASES = ('events', 'clock', 'rocket', 'bullets', 'fleet',
+              'collisions', 'render', 'scoreboard', 'flip')
+
+    # Numbers recorded once per frame.
+    COUNTERS = ('ticks', 'bullets', 'spaceships', 'collision_pairs')
+
+    def __init__(self, history=240, enabled=False):
+        """Initialize an empty ring buffer of history frames."""
+        self._phase_index = {phase: i for i, phase in enumerate(self.PHASES)}
+        self.times = np.zeros((history, len(self.PHASES)))
+        self.counts = np.zeros((history, len(self.COUNTERS)), dtype=np.int64)
+
+        # Total number of frames recorded; the newest is at frames - 1.
+        self.frames = 0
+
+        self._current = [0.0] * len(self.PHASES)
+        self._last = 0.0
+        self._pairs_tested = 0
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        """Turn the profiler on or off."""
+        self.enabled = enabled
+        self.mark = self._mark if enabled else _skip
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        self._current = [0.0] * len(self.PHASES)
+        self._last = perf_counter()
+
+    def _mark(self, phase):
+        """Add the time since the last mark to phase."""
+        now = perf_counter()
+        self._current[self._phase_index[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self, ticks, bullets, spaceships, pairs_tested):
+        """
+        Store the frame's durations and counters in the ring buffer.
+        pairs_tested is the collision grid's running total.
+        """
+        row = self.frames % len(self.times)
+        self.times[row] = self._current
+        self.counts[row] = (ticks, bullets, spaceships,
+                            pairs_tested - self._pairs_tested)
+        self._pairs_tested = pairs_tested
+        self.frames += 1
+
+    def history(self):
+        """Return the recorded durations and counters, oldest first."""
+        size = len(self.times)
+        if self.frames <= size:
+            return self.times[:self.frames], self.counts[:self.frames]
+        order = np.roll(np.arange(size), -(self.frames % size))
+        return self.times[order], self.counts[order]
+
+    def export(self, path):
+        """
+        Write the recorded frames to path, as JSON if it ends with
+        .json and as CSV otherwise. Durations are in milliseconds.
+        """
+        times, counts = self.history()
+        first = self.frames - len(times)
+        header = (['frame'] + [f'{phase}_ms' for phase in self.PHASES]
+                  + list(self.COUNTERS))
+        rows = [[first + i] + (times[i] * 1000.0).tolist() + counts[i].tolist()
+                for i in range(len(times))]
+
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.json'):
+                json.dump([dict(zip(header, row)) for row in rows], f,
+                          indent=2)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
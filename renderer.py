@@ -0,0 +1,66 @@
+import pygame
+
+
+class Renderer:
+    """
+    A class to clear the screen and present each frame.
+
+    In 'full' mode every frame fills the whole screen and flips it.
+    In 'dirty' mode only the rects drawn in the previous frame are
+    erased, and only those and the rects drawn in this frame are sent
+    to the display.
+    """
+
+    def __init__(self, sb_game):
+        """Initialize the renderer from the game's settings."""
+        self.screen = sb_game.screen
+        self.settings = sb_game.settings
+        self.mode = self.settings.render_mode
+
+        # A headless game draws off-screen and has no display to
+        # present its frames to.
+        self.present = not sb_game.headless
+
+        # Rects drawn in the previous and in the current frame.
+        self._previous = []
+        self._drawn = []
+
+        # The first frame always covers the whole screen.
+        self._full_redraw = True
+
+    def set_mode(self, mode):
+        """Switch between 'full' and 'dirty' rendering."""
+        self.mode = mode
+        self._full_redraw = True
+
+    def request_full_redraw(self):
+        """Clear and present the whole screen on the next frame."""
+        self._full_redraw = True
+
+    def begin_frame(self):
+        """Erase what was drawn in the previous frame."""
+        if self.mode == 'full' or self._full_redraw:
+            self.screen.fill(self.settings.bg_color)
+        else:
+            for rect in self._previous:
+                self.screen.fill(self.settings.bg_color, rect)
+        self._drawn = []
+
+    def add(self, rect):
+        """Record a rect that was drawn in this frame."""
+        self._drawn.append(rect)
+
+    def extend(self, rects):
+        """Record several rects that were drawn in this frame."""
+        self._drawn.extend(rects)
+
+    def end_frame(self):
+        """Send the frame to the display."""
+        if not self.present:
+            self._full_redraw = False
+        elif self.mode == 'full' or self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        else:
+            pygame.display.update(self._previous + self._drawn)
+        self._previous = self._drawn
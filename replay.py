@@ -0,0 +1,71 @@
+"""
+Replay a recorded game headless, as fast as possible and without
+rendering, and report how it ended.
+
+    python replay.py session.sbin
+"""
+import argparse
+import json
+import sys
+import time
+
+from headless import use_dummy_drivers
+from input_recording import InputReader, InputReplay
+from space_battle import SpaceBattle
+
+# The game runs without a window.
+use_dummy_drivers()
+
+
+def replay(path, game=None):
+    """Replay the recording at path and return a summary of the game."""
+    reader = InputReader(path)
+    if game is None:
+        game = SpaceBattle(headless=True)
+    game.settings.tick_rate = reader.tick_rate
+    dt = 1.0 / reader.tick_rate
+    driver = InputReplay(game, reader)
+
+    update_positions = game._update_positions
+    start = time.perf_counter()
+    tick = 0
+    while not driver.finished or (reader.end_tick is not None
+                                  and tick < reader.end_tick):
+        driver.apply(tick)
+        update_positions(dt)
+        tick += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        'ticks': tick,
+        'game_seconds': tick * dt,
+        'seconds': elapsed,
+        'ticks_per_sec': tick / elapsed if elapsed else None,
+        'score': game.stats.score,
+        'high_score': game.stats.high_score,
+        'level': game.stats.level,
+        'rockets_left': game.stats.rockets_left,
+        'state': game.stats.state,
+    }
+
+
+def main(argv=None):
+    """Replay each recording given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('recordings', nargs='+',
+                        help="files written with Settings.record_path")
+    args = parser.parse_args(argv)
+
+    game = SpaceBattle(headless=True)
+    results = {}
+    for path in args.recordings:
+        # Each recording starts from the default settings.
+        game.settings.__init__()
+        results[path] = replay(path, game)
+        print(f"{path}: {results[path]['ticks_per_sec']:.0f} ticks/sec",
+              file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
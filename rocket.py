@@ -8,13 +8,11 @@ class Rocket(Sprite):
     def __init__(self, sb_game):
         """Initialize the rocket and set its starting position."""
         super().__init__()
-        self.screen = sb_game.screen
         self.settings = sb_game.settings
-        self.screen_rect = sb_game.screen.get_rect()
-
-        # Load the rocket image and get its rect.
-        self.image = pygame.image.load('images/rocket.bmp')
-        self.rect = self.image.get_rect()
+        self.screen_rect = sb_game.field
+        self.rescale(sb_game)
+        self.rect = pygame.Rect((0, 0), sb_game.sprites.size('rocket'))
+        self.mask = sb_game.assets.mask('rocket')
 
         # Start each new rocket at the bottom center of the screen.
         self.rect.midbottom = self.screen_rect.midbottom
@@ -23,33 +21,56 @@ class Rocket(Sprite):
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
 
+        # Position at the previous tick, used to interpolate drawing.
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         # Movement flags
         self.moving_right = False
         self.moving_left = False
         self.moving_up = False
         self.moving_down = False
 
-    def update(self):
+    def rescale(self, sb_game):
+        """Draw the rocket from the sprite sheet, at the render scale."""
+        self.screen = sb_game.screen
+        self.render_scale = sb_game.render_scale
+        self.sheet = sb_game.draw_sprites.surface
+        self.area = sb_game.draw_sprites.region('rocket')
+
+    def update(self, dt):
         """Update the rocket's position based on movement flags."""
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         # Update the rocket's x and y value, not the rect.
+        step = self.settings.rocket_speed * dt
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.rocket_speed
+            self.x += step
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.rocket_speed
+            self.x -= step
         if self.moving_up and self.rect.top > 500:
-            self.y -= self.settings.rocket_speed
+            self.y -= step
         if self.moving_down and self.rect.bottom < self.screen_rect.bottom:
-            self.y += self.settings.rocket_speed
+            self.y += step
 
         # Update rect object from self.x and self.y.
         self.rect.x = self.x
         self.rect.y = self.y
 
-    def blitme(self):
-        """Draw the rocket at its current location."""
-        self.screen.blit(self.image, self.rect)
+    def blitme(self, alpha=1.0):
+        """
+        Draw the rocket alpha of the way from its previous to its
+        current position, and return the rect it covers.
+        """
+        scale = self.render_scale
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return self.screen.blit(self.sheet, (x * scale, y * scale),
+                                self.area)
 
     def center_rocket(self):
         """Center the rocket on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
-        self.x = float(self.rect.x)
+        self.x = self.prev_x = float(self.rect.x)
+        self.y = self.prev_y = float(self.rect.y)
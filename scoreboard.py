@@ -1,7 +1,6 @@
-import pygame.font
-from pygame.sprite import Group
- 
-from rocket import Rocket
+from itertools import repeat
+
+from glyph_cache import GlyphCache, GlyphText
 
 class Scoreboard:
     """A class to report scoring information."""
@@ -13,10 +12,30 @@ class Scoreboard:
         self.screen_rect = self.screen.get_rect()
         self.settings = sb_game.settings
         self.stats = sb_game.stats
+
+        # Rocket icons are drawn from the sprite sheet.
+        self.sheet = sb_game.draw_sprites.surface
+        self.rocket_area = sb_game.draw_sprites.region('rocket')
         
         # Font settings for scoring information.
         self.text_color = ((255,255,255))
-        self.font = pygame.font.SysFont("Times New Roman", 48)
+        self.font = sb_game.fonts.font("Times New Roman",
+                                       round(48 * sb_game.render_scale))
+
+        # Scores and the level are built from cached digit images, so
+        # only the digits that change are drawn again.
+        self.glyphs = GlyphCache(self.font, self.text_color,
+                                 self.settings.bg_color)
+        self.score_text = GlyphText(self.glyphs)
+        self.high_score_text = GlyphText(self.glyphs)
+        self.level_text = GlyphText(self.glyphs)
+
+        # The score and high score may be refreshed only every few
+        # frames, so a burst of hits does not re-render them each time.
+        self.refresh_interval = 1
+        self._frames_since_refresh = 0
+        self._score_stale = False
+        self._high_score_stale = False
 
         # Prepare the initial score images.
         self.set_score()
@@ -26,6 +45,14 @@ class Scoreboard:
 
     def set_score(self):
         """Turn the score into a rendered image."""
+        if self.refresh_interval > 1:
+            self._score_stale = True
+            return
+        self._prep_score()
+
+    def _prep_score(self):
+        """Render the score image."""
+        self._score_stale = False
 
         # Round the score to the nearest 10
         rounded_score = round(self.stats.score, -1)
@@ -34,8 +61,7 @@ class Scoreboard:
         score_str = "{:,}".format(rounded_score)
 
         # Create score's image
-        self.score_image = self.font.render(score_str, True,
-                self.text_color, self.settings.bg_color)
+        self.score_image = self.score_text.render(score_str)
         
         # Display the score at the top right of the screen.
         self.score_rect = self.score_image.get_rect()
@@ -44,10 +70,17 @@ class Scoreboard:
 
     def set_high_score(self):
         """Turn the high score into a rendered image."""
+        if self.refresh_interval > 1:
+            self._high_score_stale = True
+            return
+        self._prep_high_score()
+
+    def _prep_high_score(self):
+        """Render the high score image."""
+        self._high_score_stale = False
         high_score = round(self.stats.high_score, -1)
         high_score_str = "{:,}".format(high_score)
-        self.high_score_image = self.font.render(high_score_str, True,
-                self.text_color, self.settings.bg_color)
+        self.high_score_image = self.high_score_text.render(high_score_str)
             
         # Center the high score at the top of the screen.
         self.high_score_rect = self.high_score_image.get_rect()
@@ -57,8 +90,7 @@ class Scoreboard:
     def set_level(self):
         """Turn the level into a rendered image."""
         level_str = str(self.stats.level)
-        self.level_image = self.font.render(level_str, True,
-                self.text_color, self.settings.bg_color)
+        self.level_image = self.level_text.render(level_str)
     
         # Position the level below the score.
         self.level_rect = self.level_image.get_rect()
@@ -67,12 +99,26 @@ class Scoreboard:
 
     def set_rockets(self):
         """Show how many rockets are left."""
-        self.rockets = Group()
-        for rocket_number in range(self.stats.rockets_left):
-            rocket = Rocket(self.ai_game)
-            rocket.rect.x = 10 + rocket_number * rocket.rect.width
-            rocket.rect.y = 10
-            self.rockets.add(rocket)
+        width = self.rocket_area.width
+        self.rocket_positions = [(10 + rocket_number * width, 10)
+                                 for rocket_number in range(self.stats.rockets_left)]
+
+    def set_refresh_interval(self, frames):
+        """
+        Refresh the score and high score at most every frames frames;
+        1 refreshes them as soon as they change.
+        """
+        self.refresh_interval = frames
+        if frames <= 1:
+            self.refresh()
+
+    def refresh(self):
+        """Render the score and high score if they are out of date."""
+        if self._score_stale:
+            self._prep_score()
+        if self._high_score_stale:
+            self._prep_high_score()
+        self._frames_since_refresh = 0
 
     def check_high_score(self):
         """Check to see if there's a new high score."""
@@ -81,12 +127,22 @@ class Scoreboard:
             self.set_high_score()
 
     def show_score(self):
-        """Draw scores, level, and rockets to the screen."""
+        """
+        Draw scores, level, and rockets to the screen, and return the
+        rects that were drawn.
+        """
+        self._frames_since_refresh += 1
+        if self._frames_since_refresh >= self.refresh_interval:
+            self.refresh()
 
         # Draws images of total score, highest score
         # and levels on screen at the location of respective rect's
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
+        drawn = [self.screen.blit(self.score_image, self.score_rect),
+                 self.screen.blit(self.high_score_image, self.high_score_rect),
+                 self.screen.blit(self.level_image, self.level_rect)]
 
-        self.rockets.draw(self.screen)
\ No newline at end of file
+        # Draw every rocket icon in one batch.
+        drawn.extend(self.screen.blits(zip(repeat(self.sheet),
+                                           self.rocket_positions,
+                                           repeat(self.rocket_area))))
+        return drawn
@@ -8,8 +8,100 @@ class Settings:
         self.screen_height = 800
         self.bg_color = (12, 20, 69)
 
+        # Timing settings
+        # Simulation ticks per second; speeds below are per second.
+        self.tick_rate = 60
+        # Rendered frames per second; 0 means no cap.
+        self.max_frame_rate = 120
+        # Longest frame time (in seconds) the simulation catches up on.
+        self.max_frame_time = 0.25
+        # Draw moving objects between their last two tick positions.
+        self.interpolate = True
+
+        # Replay settings
+        # Seed for the random numbers; None picks a new one every game.
+        self.seed = None
+        # File to record the player's inputs to, so the game can be
+        # replayed with replay.py; None records nothing.
+        self.record_path = None
+
+        # Number of recent ticks kept as snapshots to rewind to;
+        # 0 keeps none.
+        self.rewind_ticks = 0
+
+        # Leaderboard settings
+        # File that keeps the scores of finished games; None keeps the
+        # high score only while the game runs.
+        self.leaderboard_path = 'leaderboard.dat'
+        # Number of best scores kept.
+        self.leaderboard_size = 10
+
+        # Telemetry settings
+        # Directory gameplay events are recorded to for analytics;
+        # None records nothing.
+        self.telemetry_dir = 'telemetry'
+        # Events in each preallocated batch, and number of batches.
+        self.telemetry_batch_size = 1024
+        self.telemetry_batches = 8
+        # Uncompressed bytes per file, and files kept.
+        self.telemetry_file_bytes = 1 << 20
+        self.telemetry_max_files = 20
+
+        # Spectator settings
+        # Address to stream the game to spectators on: a (host, port)
+        # tuple for TCP or a path for a Unix socket; None serves nothing.
+        self.spectator_address = None
+
+        # Startup settings
+        # File that remembers where named fonts were found, so the
+        # system's fonts are scanned only once.
+        self.font_cache_path = '.font_cache.json'
+        # Print how long startup took, up to the first frame.
+        self.startup_report = False
+
+        # Run the simulation on its own thread, so drawing and
+        # simulating overlap and a slow frame does not slow the game.
+        self.threaded = False
+
+        # Render settings
+        # Fraction of the window's resolution the game is drawn at;
+        # the frame is scaled up to fill the window.
+        self.render_scale = 1.0
+        # Wait for the display's vertical sync to present each frame
+        # instead of capping the frame rate.
+        self.vsync = False
+        # 'dirty' redraws and presents only the changed parts of the
+        # screen; 'full' clears and flips the whole screen every frame.
+        self.render_mode = 'dirty'
+
+        # Quality governor settings
+        # Step down optional drawing work when frames run over budget,
+        # and back up when there is headroom again. Changes are logged.
+        self.quality_governor = True
+        # Seconds a frame may take; None allows one frame's share of
+        # max_frame_rate (or of tick_rate if frames are not capped).
+        self.frame_budget = None
+        # Frames between HUD text refreshes while they are throttled.
+        self.hud_refresh_interval = 10
+        # render_scale is multiplied by this at the lowest quality.
+        self.low_quality_scale = 0.5
+
+        # Profiling settings
+        # Time each phase of a frame from the start; F3 toggles it
+        # together with the performance overlay.
+        self.profiling = False
+        # Number of recent frames the profiler keeps.
+        self.profile_history = 240
+        # File F4 writes the profile to: JSON if it ends with .json,
+        # CSV otherwise.
+        self.profile_export_path = 'profile.csv'
+
         # Ship settings
         self.rocket_limit = 3
+        # Seconds the game pauses after the rocket is destroyed.
+        self.rocket_hit_pause = 0.5
+        # Seconds between clearing a fleet and the next one appearing.
+        self.level_pause = 0.5
 
         # Bullet settings
         self.bullet_width = 3
@@ -20,6 +112,13 @@ class Settings:
         # Alien settings
         self.fleet_drop_speed = 5
 
+        # Collision settings
+        # Size in pixels of the grid cells used to find nearby spaceships.
+        self.collision_cell_size = 64
+        # 'rect' treats sprites as their rects; 'mask' also checks that
+        # opaque pixels overlap, for pairs whose rects overlap.
+        self.collision_mode = 'rect'
+
         # How quickly the game speeds up
         self.speedup_scale = 1.3
         # How quickly the spaceship point values increase
@@ -29,9 +128,10 @@ class Settings:
 
     def initialize_dynamic_settings(self):
         """Initialize settings that change throughout the game."""
-        self.rocket_speed = 0.6
-        self.bullet_speed = 2.0
-        self.spaceship_speed = 0.1
+        # Speeds in pixels per second
+        self.rocket_speed = 300.0
+        self.bullet_speed = 1000.0
+        self.spaceship_speed = 50.0
 
         # fleet_direction of 1 represents right; -1 represents left.
         self.fleet_direction = 1
@@ -0,0 +1,125 @@
+import queue
+import threading
+from time import perf_counter, sleep
+
+import pygame
+
+from input_recording import CLICK, KEYDOWN, KEYUP
+from snapshot import take_snapshot
+
+
+class StateBuffer:
+    """
+    A class to hand snapshots from the simulation to the renderer.
+    The simulation fills the back slot and then swaps it to the
+    front, so the renderer always reads a whole, unchanging snapshot.
+    """
+
+    def __init__(self):
+        """Initialize both slots empty."""
+        self._slots = [None, None]
+        self._front = 0
+        self._lock = threading.Lock()
+
+        # Ticks simulated and the time when the front slot was filled.
+        self.ticks = 0
+        self.published_at = 0.0
+
+    def publish(self, snapshot, ticks):
+        """Fill the back slot with snapshot and make it the front one."""
+        back = 1 - self._front
+        self._slots[back] = snapshot
+        with self._lock:
+            self._front = back
+            self.ticks = ticks
+            self.published_at = perf_counter()
+
+    def read(self):
+        """Return the front snapshot, its tick count and publish time."""
+        with self._lock:
+            return self._slots[self._front], self.ticks, self.published_at
+
+
+class SimulationThread(threading.Thread):
+    """
+    A class to run a headless copy of the game on its own thread at
+    the fixed tick rate, applying the player's inputs as they arrive
+    and publishing a snapshot after every batch of ticks.
+    """
+
+    def __init__(self, sim_game):
+        """Initialize the thread to run sim_game, a headless game."""
+        super().__init__(name='simulation', daemon=True)
+        self.sim_game = sim_game
+        self.settings = sim_game.settings
+        self.dt = sim_game.clock.dt
+        self.states = StateBuffer()
+        self._inputs = queue.SimpleQueue()
+        self._running = True
+
+    def send(self, kind, value):
+        """Queue an input to apply before the next tick."""
+        self._inputs.put((kind, value))
+
+    def stop(self):
+        """Stop the thread after the tick it is running."""
+        self._running = False
+
+    def alpha(self):
+        """Return how far the time since the last snapshot is into a tick."""
+        _, _, published_at = self.states.read()
+        return min((perf_counter() - published_at) / self.dt, 1.0)
+
+    def run(self):
+        """Simulate ticks as they fall due until stopped."""
+        game = self.sim_game
+        dt = self.dt
+        clock = game.clock
+        accumulator = 0.0
+        last = perf_counter()
+        self.states.publish(take_snapshot(game), clock.ticks)
+        while self._running:
+            now = perf_counter()
+            accumulator += min(now - last, self.settings.max_frame_time)
+            last = now
+
+            self._apply_inputs()
+            ran = 0
+            while accumulator >= dt:
+                game._update_positions(dt)
+                clock.ticks += 1
+                accumulator -= dt
+                ran += 1
+            if ran:
+                self.states.publish(take_snapshot(game), clock.ticks)
+
+            # Sleep until the next tick is due.
+            sleep(max(dt - accumulator, 0.0))
+
+    def _apply_inputs(self):
+        """
+        Apply every queued input to the simulated game, and record it
+        at the simulation's tick if the game is being recorded.
+        """
+        game = self.sim_game
+        recorder = game.recorder
+        while True:
+            try:
+                kind, value = self._inputs.get_nowait()
+            except queue.Empty:
+                return
+            if recorder:
+                if kind == KEYDOWN:
+                    recorder.key_down(game.clock.ticks, value)
+                elif kind == KEYUP:
+                    recorder.key_up(game.clock.ticks, value)
+                elif kind == CLICK:
+                    recorder.click(game.clock.ticks, value)
+            if kind == KEYDOWN:
+                game._check_keydown_events(
+                    pygame.event.Event(pygame.KEYDOWN, key=value))
+            elif kind == KEYUP:
+                game._check_keyup_events(
+                    pygame.event.Event(pygame.KEYUP, key=value))
+            elif kind == CLICK:
+                game._press_play_button(value)
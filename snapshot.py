@@ -0,0 +1,140 @@
+from collections import deque
+import struct
+
+import numpy as np
+
+
+# A snapshot is this header followed by the fleet's x, y, previous x,
+# previous y (float64) and alive (bool) arrays, then the bullets' x, y
+# and previous y (float64) arrays.
+MAGIC = b'SBSS'
+_HEADER = struct.Struct(
+    '<4s'      # magic
+    'dddqb'    # rocket, bullet and spaceship speeds, points, direction
+    'iqiqBd'   # rockets left, score, level, high score, state, time left
+    'ddddB'    # rocket x, y, previous x, previous y, movement flags
+    'ddI'      # fleet offset x and y, number of spaceships
+    'IQ'       # number of bullets, ticks simulated
+)
+
+
+def _states(stats):
+    """Return the game states in the order snapshots number them."""
+    return (stats.PLAYING, stats.ROCKET_DESTROYED, stats.LEVEL_TRANSITION,
+            stats.GAME_OVER)
+
+
+def take_snapshot(sb_game):
+    """Return the state of sb_game as bytes."""
+    settings = sb_game.settings
+    stats = sb_game.stats
+    rocket = sb_game.rocket
+    fleet = sb_game.spaceships
+    bullets = sb_game.bullets.active
+
+    flags = (rocket.moving_right | rocket.moving_left << 1
+             | rocket.moving_up << 2 | rocket.moving_down << 3)
+    header = _HEADER.pack(
+        MAGIC,
+        settings.rocket_speed, settings.bullet_speed,
+        settings.spaceship_speed, settings.spaceship_points,
+        settings.fleet_direction,
+        stats.rockets_left, stats.score, stats.level, stats.high_score,
+        _states(stats).index(stats.state), stats.state_time_left,
+        rocket.x, rocket.y, rocket.prev_x, rocket.prev_y, flags,
+        fleet.offset_x, fleet.offset_y, len(fleet.x),
+        len(bullets), sb_game.clock.ticks)
+
+    bullet_state = np.array([(b.rect.x, b.y, b.prev_y) for b in bullets],
+                            dtype=np.float64).reshape(-1, 3)
+    return b''.join((header, fleet.x.tobytes(), fleet.y.tobytes(),
+                     fleet.prev_x.tobytes(), fleet.prev_y.tobytes(),
+                     fleet.alive.tobytes(), bullet_state.T.tobytes()))
+
+
+def restore_snapshot(sb_game, data):
+    """
+    Put sb_game back in the state stored in data. Sprites and images
+    are reused; nothing is loaded again. The game's clock is left
+    alone, so it keeps counting the ticks that have run.
+    """
+    (magic, rocket_speed, bullet_speed, spaceship_speed, spaceship_points,
+     fleet_direction, rockets_left, score, level, high_score, state,
+     state_time_left, rocket_x, rocket_y, rocket_prev_x, rocket_prev_y,
+     flags, offset_x, offset_y, ships, bullet_count,
+     ticks) = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a Space Battle snapshot")
+
+    settings = sb_game.settings
+    settings.rocket_speed = rocket_speed
+    settings.bullet_speed = bullet_speed
+    settings.spaceship_speed = spaceship_speed
+    settings.spaceship_points = spaceship_points
+    settings.fleet_direction = fleet_direction
+
+    stats = sb_game.stats
+    stats.rockets_left = rockets_left
+    stats.score = score
+    stats.level = level
+    stats.high_score = high_score
+    stats.set_state(_states(stats)[state], state_time_left)
+
+    rocket = sb_game.rocket
+    rocket.x, rocket.y = rocket_x, rocket_y
+    rocket.prev_x, rocket.prev_y = rocket_prev_x, rocket_prev_y
+    rocket.rect.x = rocket_x
+    rocket.rect.y = rocket_y
+    rocket.moving_right = bool(flags & 1)
+    rocket.moving_left = bool(flags & 2)
+    rocket.moving_up = bool(flags & 4)
+    rocket.moving_down = bool(flags & 8)
+
+    offset = _HEADER.size
+    arrays = np.frombuffer(data, np.float64, 4 * ships, offset)
+    offset += arrays.nbytes
+    alive = np.frombuffer(data, np.bool_, ships, offset)
+    offset += alive.nbytes
+    fleet = sb_game.spaceships
+    fleet.restore(*arrays.reshape(4, ships), alive, offset_x, offset_y)
+
+    bullet_state = np.frombuffer(data, np.float64, 3 * bullet_count, offset)
+    sb_game.bullets.restore(*bullet_state.reshape(3, bullet_count))
+
+    scoreboard = sb_game.scoreboard
+    scoreboard.set_score()
+    scoreboard.set_high_score()
+    scoreboard.set_level()
+    scoreboard.set_rockets()
+
+
+class RewindBuffer:
+    """
+    A class to keep snapshots of the last ticks. Only capacity
+    snapshots are kept, so memory stays bounded in long sessions.
+    """
+
+    def __init__(self, capacity):
+        """Initialize an empty buffer of capacity snapshots."""
+        self.snapshots = deque(maxlen=capacity)
+
+    def __len__(self):
+        """Return the number of snapshots kept."""
+        return len(self.snapshots)
+
+    def record(self, sb_game):
+        """Add a snapshot of sb_game, dropping the oldest if full."""
+        self.snapshots.append(take_snapshot(sb_game))
+
+    def rewind(self, sb_game, ticks):
+        """
+        Restore sb_game to how it was ticks snapshots ago, and forget
+        the snapshots after that one. Return False if there are none.
+        """
+        if not self.snapshots:
+            return False
+        for _ in range(min(ticks, len(self.snapshots) - 1)):
+            self.snapshots.pop()
+        restore_snapshot(sb_game, self.snapshots[-1])
+        sb_game.renderer.request_full_redraw()
+        return True
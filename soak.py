@@ -0,0 +1,190 @@
+"""
+Play the game headless with the autopilot for hours of game time at
+uncapped speed, and fail if memory or frame time trends upward.
+
+    python soak.py --hours 2 --sample-minutes 5 --output soak.jsonl
+"""
+import argparse
+import collections
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from autopilot import Autopilot
+from headless import summarize, use_dummy_drivers
+from space_battle import SpaceBattle
+
+# The game runs without a window.
+use_dummy_drivers()
+
+
+def _object_counts():
+    """Return the number of live objects of every class, by class name."""
+    gc.collect()
+    return collections.Counter(type(o).__qualname__ for o in gc.get_objects())
+
+
+def _growth(values):
+    """
+    Return how much a straight line fitted through values rises from
+    the first sample to the last, as a fraction of where it starts.
+    """
+    if len(values) < 3:
+        return 0.0
+    x = np.arange(len(values))
+    slope, start = np.polyfit(x, values, 1)
+    if start <= 0:
+        return 0.0
+    return float(slope * (len(values) - 1) / start)
+
+
+# Memory the soak test allocates itself is left out of its samples.
+_OWN_TRACES = [tracemalloc.Filter(False, __file__),
+               tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+               tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>')]
+
+
+class Soak:
+    """A long autopilot session that samples memory and frame times."""
+
+    def __init__(self, seed=0, render=True, warmup=1, top_classes=10):
+        """
+        Initialize a headless game and a player for it. The first
+        warmup samples include caches filling and modules loading, so
+        trends are measured from the sample after them.
+        """
+        self.game = SpaceBattle(headless=True)
+        self.player = Autopilot(self.game, seed)
+        self.render = render
+        self.warmup = warmup
+        self.top_classes = top_classes
+
+        self.ticks = 0
+        self.games = 0
+        self.samples = []
+        self._baseline = None
+        self._first_counts = None
+
+    def run(self, ticks):
+        """Play ticks ticks, starting a new game whenever one ends."""
+        game = self.game
+        stats = game.stats
+        dt = game.clock.dt
+        perf_counter = time.perf_counter
+        frame_times = []
+        for _ in range(ticks):
+            if not stats.game_active:
+                game._press_play_button(game.start_button.field_rect.center)
+                self.games += 1
+            t0 = perf_counter()
+            self.player.act()
+            game._update_positions(dt)
+            if self.render:
+                game._update_screen()
+            frame_times.append(perf_counter() - t0)
+        self.ticks += ticks
+        return frame_times
+
+    def sample(self, frame_times):
+        """Record memory, object counts and frame times, and return them."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_OWN_TRACES)
+        counts = _object_counts()
+        if len(self.samples) == self.warmup:
+            self._baseline = snapshot
+            self._first_counts = dict(counts)
+
+        # Where memory has grown since the first sample after warming
+        # up, and which classes have more live objects than they had then.
+        growth = []
+        grown = {}
+        if self._baseline is not None:
+            growth = [f"{stat.traceback}: {stat.size_diff / 1024:+.1f} KiB"
+                      for stat in snapshot.compare_to(self._baseline, 'lineno')
+                      [:self.top_classes] if stat.size_diff > 0]
+            counts.subtract(self._first_counts)
+            grown = {name: count for name, count in
+                     counts.most_common(self.top_classes) if count > 0}
+
+        sample = {
+            'game_minutes': self.ticks * self.game.clock.dt / 60,
+            'games': self.games,
+            'level': self.game.stats.level,
+            'traced_kib': sum(stat.size for stat in
+                              snapshot.statistics('filename')) / 1024,
+            'frame': summarize(frame_times),
+            'memory_growth': growth,
+            'object_growth': grown,
+        }
+        self.samples.append(sample)
+        return sample
+
+    def verdict(self, max_memory_growth, max_frame_growth):
+        """
+        Return the memory and frame-time trends across the samples
+        after warming up, and whether they are in bounds.
+        """
+        samples = self.samples[self.warmup:]
+        memory = _growth([s['traced_kib'] for s in samples])
+        frame = _growth([s['frame']['p95_ms'] for s in samples])
+        return {
+            'samples': len(samples),
+            'memory_growth': memory,
+            'frame_p95_growth': frame,
+            'passed': (memory <= max_memory_growth
+                       and frame <= max_frame_growth),
+        }
+
+
+def main(argv=None):
+    """Run a soak test and return its exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hours', type=float, default=1.0,
+                        help="game time to play")
+    parser.add_argument('--sample-minutes', type=float, default=5.0,
+                        help="game time between samples")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="seed for the autopilot")
+    parser.add_argument('--no-render', action='store_true',
+                        help="only simulate, without drawing frames")
+    parser.add_argument('--max-memory-growth', type=float, default=0.1,
+                        help="fail if traced memory trends up by more "
+                             "than this fraction")
+    parser.add_argument('--max-frame-growth', type=float, default=0.25,
+                        help="fail if p95 frame time trends up by more "
+                             "than this fraction")
+    parser.add_argument('--output', help="also append JSON lines here")
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    soak = Soak(args.seed, render=not args.no_render)
+    tick_rate = soak.game.settings.tick_rate
+    sample_ticks = max(1, int(args.sample_minutes * 60 * tick_rate))
+    samples = max(1, int(args.hours * 60 / args.sample_minutes))
+
+    start = time.perf_counter()
+    output = open(args.output, 'a') if args.output else None
+    for _ in range(samples):
+        line = json.dumps(soak.sample(soak.run(sample_ticks)))
+        print(line, flush=True)
+        if output:
+            output.write(line + '\n')
+            output.flush()
+
+    verdict = soak.verdict(args.max_memory_growth, args.max_frame_growth)
+    line = json.dumps({'verdict': verdict})
+    print(line)
+    if output:
+        output.write(line + '\n')
+        output.close()
+    print(f"{soak.ticks} ticks, {soak.games} games in "
+          f"{time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return 0 if verdict['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,115 +1,458 @@
+import json
+import random
 import sys
-from time import sleep
 
 import pygame
 
 from settings import Settings
+from fonts import FontCache
+from assets import Assets
+from game_clock import GameClock
 from game_stats import GameStats
 from scoreboard import Scoreboard
 from play_button import PlayButton
 from rocket import Rocket
-from bullet import Bullet
-from spaceship import SpaceShip
+from bullet import BulletPool
+from fleet import Fleet
+from formation import grid_formation
+from collisions import SpatialHash
+from renderer import Renderer
+from profiler import Profiler, StartupTimer
+from perf_overlay import PerfOverlay
+from input_recording import InputRecorder, KEYS, KEYDOWN, KEYUP, CLICK
+from leaderboard import Leaderboard
+from snapshot import RewindBuffer, restore_snapshot
+from simulation import SimulationThread
+from governor import QualityGovernor
+from telemetry import Telemetry, SHOT, KILL, LIFE_LOST, LEVEL
 
 class SpaceBattle:
     """Main class that manages game's assets"""
 
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init()
+    def __init__(self, headless=False, scripted=False):
+        """
+        Initialize the game, and create game resources.
+        A headless game draws to an off-screen surface and opens
+        no window. A scripted game is played by a program rather than
+        a person; headless games always are.
+        """
+        self.startup = StartupTimer()
+
+        # Start only the subsystems the game uses; audio and joysticks
+        # are slow to bring up and never needed.
+        pygame.display.init()
+        pygame.font.init()
+        self.headless = headless
+        self.scripted = scripted or headless
 
         # Get game's settings
         self.settings = Settings()
-
-        # Create a main display
-        self.screen = pygame.display.set_mode((1200, 800))
-
-        # Set a main display's name
-        pygame.display.set_caption("Space Battle")
+        self.startup.mark('subsystems')
+
+        # The game is simulated in the play field's coordinates, and
+        # drawn at render_scale times that size.
+        self.field = pygame.Rect(0, 0, self.settings.screen_width,
+                                 self.settings.screen_height)
+        self.render_scale = self.settings.render_scale
+        self._create_screen()
+        if not headless:
+            # Set a main display's name
+            pygame.display.set_caption("Space Battle")
+        self.startup.mark('display')
+
+        # Seed the random numbers, so a recorded game replays exactly
+        self.seed = self.settings.seed
+        if self.seed is None:
+            self.seed = random.randrange(2 ** 32)
+        random.seed(self.seed)
+
+        # Load each image once and share it between all sprites
+        self.assets = Assets()
+
+        # Pack the sprites into one sheet, so each layer is one batch
+        self.sprites = self.assets.atlas('sprites', ('spaceship', 'rocket'))
+        self.draw_sprites = self.assets.scaled_atlas(
+            'sprites', ('spaceship', 'rocket'), self.render_scale)
+        self.startup.mark('assets')
 
         # Create an instance to store game statistics
         self.stats = GameStats(self)
 
+        # Load the best scores of earlier games. Scripted games are
+        # not played by people, so they stay off the leaderboard.
+        self.leaderboard = None
+        if self.settings.leaderboard_path and not self.scripted:
+            self.leaderboard = Leaderboard(self.settings.leaderboard_path,
+                                           self.settings.leaderboard_size)
+            self.stats.high_score = self.leaderboard.high_score()
+        self.startup.mark('leaderboard')
+
+        # Record gameplay events for analytics. Like the leaderboard,
+        # this is only for games played by people.
+        self.telemetry = None
+        if self.settings.telemetry_dir and not self.scripted:
+            self.telemetry = Telemetry(self.settings.telemetry_dir,
+                                       self.settings.telemetry_batch_size,
+                                       self.settings.telemetry_batches,
+                                       self.settings.telemetry_file_bytes,
+                                       self.settings.telemetry_max_files)
+
+        # Find fonts without scanning the system's fonts every start
+        self.fonts = FontCache(self.settings.font_cache_path)
+
         # Create a scoreboard
         self.scoreboard = Scoreboard(self)
+        self.startup.mark('scoreboard')
 
         # Create a rocket
         self.rocket = Rocket(self)
 
-        # Create a list of bullets
-        self.bullets = pygame.sprite.Group()
+        # Create a pool of reusable bullets
+        self.bullets = BulletPool(self)
 
         # Create a fleet of spaceships
-        self.spaceships = pygame.sprite.Group()
+        self.spaceships = Fleet(self)
         self._create_fleet()
 
+        # Create a grid to find spaceships near bullets and the rocket
+        self.collision_grid = SpatialHash(self.settings.collision_cell_size)
+
         # Make the Start button.
         self.start_button = PlayButton(self, "Start")
 
+        # Create a clock that runs the simulation at a fixed rate
+        self.clock = GameClock(self.settings)
+
+        # Create a renderer that clears and presents each frame
+        self.renderer = Renderer(self)
+
+        # Create a profiler that times each phase of a frame, and an
+        # overlay that shows its results
+        self.profiler = Profiler(self.settings.profile_history,
+                                 self.settings.profiling)
+        self.perf_overlay = PerfOverlay(self)
+
+        # Record the player's inputs if asked to. Scripted games have
+        # no player, and must not write over the player's recording.
+        self.recorder = None
+        if self.settings.record_path and not self.scripted:
+            self.recorder = InputRecorder(self.settings.record_path,
+                                          self.seed, self.settings.tick_rate)
+
+        # Keep a snapshot of every recent tick to rewind to, if asked to
+        self.rewind = None
+        if self.settings.rewind_ticks:
+            self.rewind = RewindBuffer(self.settings.rewind_ticks)
+
+        # Stream every tick to spectators, if asked to. The server
+        # brings in asyncio, so it is only imported when it is used.
+        self.spectators = None
+        if self.settings.spectator_address and not headless:
+            from spectator import SpectatorServer
+            self.spectators = SpectatorServer(self.settings.spectator_address)
+
+        # Step drawing work down when frames run over budget. Headless
+        # games draw only when asked to, so they are not governed.
+        self.governor = None
+        if self.settings.quality_governor and not headless:
+            self.governor = QualityGovernor(self.settings)
+
+        # Scoreboard, Start button and overlay for each render scale
+        # the governor has drawn at
+        self._huds = {}
+
+        # The simulation thread, if the game runs one
+        self.simulation = None
+        self._simulated_ticks = 0
+        self.startup.mark('game_objects')
+
+    def _create_screen(self):
+        """Create the screen the game is drawn on, at the render scale."""
+        size = (round(self.field.width * self.render_scale),
+                round(self.field.height * self.render_scale))
+        if self.headless:
+            self.screen = pygame.Surface(size)
+        else:
+            # Create a main display. SCALED lets the display scale the
+            # smaller frame up, and is needed for vsync.
+            flags = 0
+            if self.render_scale != 1.0 or self.settings.vsync:
+                flags = pygame.SCALED
+            self.screen = pygame.display.set_mode(
+                size, flags, vsync=int(self.settings.vsync))
+
+    def _set_render_scale(self, scale):
+        """
+        Draw the game at a new render scale from the next frame on.
+        Return False, keeping the old scale, if the display cannot be
+        set to it.
+        """
+        old_scale = self.render_scale
+        self.render_scale = scale
+        try:
+            self._create_screen()
+        except pygame.error:
+            self.render_scale = old_scale
+            self._create_screen()
+            return False
+        self.draw_sprites = self.assets.scaled_atlas(
+            'sprites', ('spaceship', 'rocket'), scale)
+        self.rocket.rescale(self)
+        self.bullets.rescale(self)
+        self.spaceships.rescale(self)
+
+        # The HUD is built once for each scale, fonts and all, and
+        # only pointed at the new screen when the scale comes back.
+        self._huds[old_scale] = (self.scoreboard, self.start_button,
+                                 self.perf_overlay)
+        hud = self._huds.get(scale)
+        if hud is None:
+            hud = (Scoreboard(self), PlayButton(self, "Start"),
+                   PerfOverlay(self))
+        for part in hud:
+            part.screen = self.screen
+        refresh_interval = self.scoreboard.refresh_interval
+        overlay_visible = self.perf_overlay.visible
+        self.scoreboard, self.start_button, self.perf_overlay = hud
+        self.perf_overlay.visible = overlay_visible
+
+        # Bring the scoreboard up to date with the game.
+        scoreboard = self.scoreboard
+        scoreboard.set_refresh_interval(refresh_interval)
+        scoreboard.set_score()
+        scoreboard.set_high_score()
+        scoreboard.refresh()
+        scoreboard.set_level()
+        scoreboard.set_rockets()
+        render_mode = self.renderer.mode
+        self.renderer = Renderer(self)
+        self.renderer.mode = render_mode
+        return True
+
     def run_game(self):
         """Start game's main loop."""
+        # Show the first frame straight away.
+        self._update_screen()
+        self.startup.mark('first_frame')
+        if self.settings.startup_report:
+            print(json.dumps({'startup': self.startup.report()}),
+                  file=sys.stderr)
+
+        if self.settings.threaded:
+            self._start_simulation()
+
+        profiler = self.profiler
         while True:
+            profiler.begin_frame()
+
             # Monitors key presses and releases
             self._check_key_mouse_events()
-
-            # Updates positions of game's moving elements
-            self._update_positions()
+            profiler.mark('events')
+
+            # Updates positions of game's moving elements once for
+            # every simulation tick that is due
+            ticks = self.clock.tick()
+            profiler.mark('clock')
+            if self.governor:
+                self.governor.begin_frame()
+            if self.simulation is None:
+                for _ in range(ticks):
+                    self._update_positions(self.clock.dt)
+            else:
+                # The simulation thread runs the ticks; show its
+                # latest state.
+                ticks = self._sync_simulation()
 
             # Flipping the main screen
             self._update_screen()
 
-    def _update_positions(self):
-        """Update the position of a rocket, bullets, and spaceships."""
-        if self.stats.game_active:
-            self.rocket.update()
-            self._update_bullets()
-            self._update_spaceships()
+            if profiler.enabled:
+                profiler.end_frame(ticks, len(self.bullets),
+                                   len(self.spaceships),
+                                   self.collision_grid.pairs_tested)
+
+    def _start_simulation(self):
+        """
+        Start a headless copy of this game on a simulation thread.
+        From then on this game only handles events and draws the
+        snapshots the thread publishes.
+        """
+        sim_game = SpaceBattle(headless=True)
+        sim_game.settings.__dict__.update(self.settings.__dict__)
+        sim_game.stats.high_score = self.stats.high_score
+
+        # The simulation starts from this game's seed, like a replay
+        # of its recording does.
+        sim_game.seed = self.seed
+        random.seed(self.seed)
+
+        # Gameplay events and ticks happen on the simulation thread
+        # from now on. Inputs are recorded there too, at the tick
+        # they are applied before, so the recording replays exactly.
+        sim_game.recorder = self.recorder
+        sim_game.telemetry = self.telemetry
+        sim_game.spectators = self.spectators
+        self.simulation = SimulationThread(sim_game)
+        self.simulation.start()
+
+    def _sync_simulation(self):
+        """
+        Show the simulation thread's latest snapshot, and return the
+        number of ticks it simulated since the last one shown.
+        """
+        snapshot, ticks, _ = self.simulation.states.read()
+        new_ticks = ticks - self._simulated_ticks
+        if not new_ticks:
+            return 0
+        self._simulated_ticks = ticks
+
+        was_active = self.stats.game_active
+        restore_snapshot(self, snapshot)
+        if was_active and not self.stats.game_active:
+            self._game_over()
+        return new_ticks
+
+    def _update_positions(self, dt):
+        """
+        Update the position of a rocket, bullets, and spaceships
+        by one simulation tick of dt seconds.
+        """
+        if self.stats.state == self.stats.PLAYING:
+            self.stats.level_time += dt
+            self.rocket.update(dt)
+            self.profiler.mark('rocket')
+            self._update_bullets(dt)
+            self._update_spaceships(dt)
+        elif self.stats.game_active:
+            self._update_pause(dt)
+
+        if self.rewind is not None:
+            self.rewind.record(self)
+        if self.spectators:
+            self.spectators.publish(self)
+
+    def _update_pause(self, dt):
+        """
+        Count down a pause by one tick, and carry on playing when
+        it is over. Events and drawing go on during the pause.
+        """
+        self.stats.state_time_left -= dt
+        if self.stats.state_time_left > 0:
+            return
+
+        if self.stats.state == self.stats.ROCKET_DESTROYED:
+            # Get rid of any remaining spaceships and bullets.
+            self.spaceships.empty()
+            self.bullets.empty()
+
+            # Create a new fleet and center the rocket.
+            self._create_fleet()
+            self.rocket.center_rocket()
+        elif self.stats.state == self.stats.LEVEL_TRANSITION:
+            self._create_fleet()
+        self.stats.set_state(self.stats.PLAYING)
 
     def _check_key_mouse_events(self):
         """Respond to key presses and mouse events."""
+        recorder = self.recorder
+        simulation = self.simulation
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                sys.exit()
+                self._quit()
             elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
+                if recorder and not simulation:
+                    recorder.key_down(self.clock.ticks, event.key)
+                if simulation and event.key in KEYS:
+                    simulation.send(KEYDOWN, event.key)
+                else:
+                    self._check_keydown_events(event)
             elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
+                if recorder and not simulation:
+                    recorder.key_up(self.clock.ticks, event.key)
+                if simulation and event.key in KEYS:
+                    simulation.send(KEYUP, event.key)
+                else:
+                    self._check_keyup_events(event)
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                self._press_play_button(mouse_pos)
+                # Clicks are handled in play-field coordinates, so they
+                # mean the same at every render scale.
+                mouse_pos = self._field_position(event.pos)
+                if recorder and not simulation:
+                    recorder.click(self.clock.ticks, mouse_pos)
+                if simulation:
+                    simulation.send(CLICK, mouse_pos)
+                    if not self.stats.game_active:
+                        pygame.mouse.set_visible(
+                            not self.start_button.field_rect
+                            .collidepoint(mouse_pos))
+                else:
+                    self._press_play_button(mouse_pos)
+
+    def _field_position(self, screen_pos):
+        """Return a position on the screen in play-field coordinates."""
+        scale = self.render_scale
+        return int(screen_pos[0] / scale), int(screen_pos[1] / scale)
+
+    def _quit(self):
+        """
+        Finish the input recording, leaderboard and telemetry writes,
+        stop serving spectators, and exit.
+        """
+        ticks = self.clock.ticks
+        if self.simulation:
+            self.simulation.stop()
+            self.simulation.join()
+            ticks = self.simulation.sim_game.clock.ticks
+        if self.recorder:
+            self.recorder.close(ticks)
+        if self.leaderboard:
+            self.leaderboard.close()
+        if self.telemetry:
+            self.telemetry.close()
+        if self.spectators:
+            self.spectators.close()
+        sys.exit()
 
     def _press_play_button(self, mouse_pos):
-        """Start a new game when the player clicks Play."""
+        """
+        Start a new game when the player clicks Play. mouse_pos is in
+        play-field coordinates.
+        """
 
         # Returns true if the point of a mouse click overlaps
         # with the start button
-        button_clicked = self.start_button.rect.collidepoint(mouse_pos)
+        button_clicked = self.start_button.field_rect.collidepoint(mouse_pos)
 
         # If the button is clicked and the game has not started yet,
         # it means player starts a new game. So, reset the game.
         if button_clicked and not self.stats.game_active:
-            self._reset_dynamic_settings()
-            self._reset_games_stats()
+            self._start_new_game()
 
-            # Get rid of any remaining spaceships
-            self.spaceships.empty()
+            # Hide the mouse cursor.
+            if not self.headless:
+                pygame.mouse.set_visible(False)
 
-            # Get rid of any remaining bullets
-            self.bullets.empty()
-            
-            # Create a new fleet
-            self._create_fleet()
+    def _start_new_game(self):
+        """Reset the settings, statistics, fleet and rocket, and play."""
+        self._reset_dynamic_settings()
+        self._reset_games_stats()
 
-            # Center the rocket
-            self.rocket.center_rocket()
+        # Get rid of any remaining spaceships
+        self.spaceships.empty()
 
-            # Hide the mouse cursor.
-            pygame.mouse.set_visible(False)
+        # Get rid of any remaining bullets
+        self.bullets.empty()
+
+        # Create a new fleet
+        self._create_fleet()
+
+        # Center the rocket
+        self.rocket.center_rocket()
 
     def _reset_games_stats(self):
         """Reset the game statistics."""
         self.stats.reset_stats()
-        self.stats.game_active = True
+        self.stats.set_state(self.stats.PLAYING)
         self.scoreboard.set_score()
         self.scoreboard.set_level()
         self.scoreboard.set_rockets()
@@ -129,9 +472,13 @@ class SpaceBattle:
         elif event.key == pygame.K_DOWN:
             self.rocket.moving_down = True
         elif event.key == pygame.K_q:
-            sys.exit()
+            self._quit()
         elif event.key == pygame.K_SPACE:
             self._fire_bullet()
+        elif event.key == pygame.K_F3:
+            self.perf_overlay.toggle()
+        elif event.key == pygame.K_F4:
+            self.profiler.export(self.settings.profile_export_path)
 
     def _check_keyup_events(self, event):
         """Respond to key releases."""
@@ -148,34 +495,39 @@ class SpaceBattle:
         """
         If the number of current bullets on the screen
         is less than number of bullets allowed to be fired, then
-        create a new bullet and add it to the bullets group.
+        launch a bullet from the pool.
         """
-        if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
-
-    def _update_bullets(self):
+        if (self.stats.state == self.stats.PLAYING
+                and len(self.bullets) < self.settings.bullets_allowed):
+            self.bullets.fire(self.rocket.rect.midtop)
+            if self.telemetry:
+                self.telemetry.record(SHOT, self.stats.level,
+                                      len(self.bullets))
+
+    def _update_bullets(self, dt):
         """Update position of bullets and get rid of old bullets."""
         # Update bullet positions.
-        self.bullets.update()
+        self.bullets.update(dt)
 
         self._clean_off_screen_bullets()
+        self.profiler.mark('bullets')
 
         self._check_bullet_spaceship_collisions()
+        self.profiler.mark('collisions')
 
     def _clean_off_screen_bullets(self):
         """Get rid of bullets that are off screen."""
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
+        self.bullets.remove_off_screen()
 
     def _check_bullet_spaceship_collisions(self):
         """Respond to bullet-spaceship collisions."""
 
-        # Returns dictionary containing bullets (key) and spaceships (values) that
-        # were hit
-        collisions = pygame.sprite.groupcollide(
-                self.bullets, self.spaceships, True, True)
+        # Returns dictionary containing bullets (key) and indices of
+        # spaceships (values) that were hit
+        self.collision_grid.sync(self.spaceships)
+        collisions = self.collision_grid.collide_bullets(
+                self.bullets, self.spaceships,
+                self.settings.collision_mode == 'mask')
 
         self._update_total_score(collisions)
 
@@ -184,13 +536,19 @@ class SpaceBattle:
     def _increase_difficulty(self):
         """
         If there are no more spaceships on the screen, the
-        increase the difficulty of the game
+        increase the difficulty of the game. The new fleet appears
+        after a short pause.
         """
-        if not self.spaceships:
-            # Destroy existing bullets and create new fleet.
+        if not self.spaceships and self.stats.state == self.stats.PLAYING:
+            # Destroy existing bullets and wait for the new fleet.
             self.bullets.empty()
-            self._create_fleet()
+            self.stats.set_state(self.stats.LEVEL_TRANSITION,
+                                 self.settings.level_pause)
             self.settings.increase_speed()
+            if self.telemetry:
+                self.telemetry.record(LEVEL, self.stats.level,
+                                      self.stats.level_time)
+            self.stats.level_time = 0.0
 
             # Increase level.
             self.stats.level += 1
@@ -201,128 +559,173 @@ class SpaceBattle:
         # If collision dictionary exists, then add spaceships' total value to
         # a score.
         if collisions:
+            kills = 0
             for spaceships in collisions.values():
-                self.stats.score += self.settings.spaceship_points * len(spaceships)
+                kills += len(spaceships)
+            self.stats.score += self.settings.spaceship_points * kills
+            if self.telemetry:
+                self.telemetry.record(KILL, self.stats.level, kills)
 
             # Create new image of updated total score
             self.scoreboard.set_score()
             self.scoreboard.check_high_score()
 
-    def _update_spaceships(self):
+    def _update_spaceships(self, dt):
         """
         Check if the fleet is at an border of a screen,
           then update the positions of spaceships' fleet.
         """
-        self._check_fleet_edges()
-        self.spaceships.update()
+        if self.spaceships.check_edges(self.field):
+            self.spaceships.change_direction()
+        self.spaceships.update(dt)
+        self.profiler.mark('fleet')
 
         # If the rocket touches an spaceship, then rocket is hit
-        if pygame.sprite.spritecollideany(self.rocket, self.spaceships):
+        self.collision_grid.sync(self.spaceships)
+        mask = None
+        if self.settings.collision_mode == 'mask':
+            mask = self.rocket.mask
+        if len(self.collision_grid.query(self.spaceships, self.rocket.rect,
+                                         mask)):
             self._rocket_hit()
-
-        self._check_spaceships_bottom()
+        else:
+            self._check_spaceships_bottom()
+        self.profiler.mark('collisions')
 
     def _check_spaceships_bottom(self):
         """Check if any spaceships have reached the bottom of the screen."""
-        screen_rect = self.screen.get_rect()
-        for spaceship in self.spaceships.sprites():
-            if spaceship.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as if the rocket got hit.
-                self._rocket_hit()
-                break
+        if self.spaceships.check_bottom(self.field):
+            # Treat this the same as if the rocket got hit.
+            self._rocket_hit()
 
     def _rocket_hit(self):
         """Respond to the rocket being hit by an spaceship."""
+        if self.telemetry:
+            self.telemetry.record(LIFE_LOST, self.stats.level,
+                                  self.stats.score)
         if self.stats.rockets_left > 0:
             # Decrement rockets_left, and update scoreboard.
             self.stats.rockets_left -= 1
             self.scoreboard.set_rockets()
-            
-            # Get rid of any remaining spaceships and bullets.
-            self.spaceships.empty()
-            self.bullets.empty()
-            
-            # Create a new fleet and center the rocket.
-            self._create_fleet()
-            self.rocket.center_rocket()
-            
-            # Pause a game to let player see what happened
-            sleep(0.5)
+
+            # Pause a game to let player see what happened. The new
+            # fleet is created when the pause is over.
+            self.stats.set_state(self.stats.ROCKET_DESTROYED,
+                                 self.settings.rocket_hit_pause)
         else:
-            self.stats.game_active = False
+            self._game_over()
+
+            # Hand the finished game's events to the writer.
+            if self.telemetry:
+                self.telemetry.flush()
+
+    def _game_over(self):
+        """End the game and keep it on the leaderboard."""
+        self.stats.set_state(self.stats.GAME_OVER)
+        if not self.headless:
             pygame.mouse.set_visible(True)
 
+        # Keep the finished game on the leaderboard.
+        if self.leaderboard:
+            self.leaderboard.record(self.stats.score, self.stats.level)
+
     def _create_fleet(self):
-        """Create the fleet of spaceships."""
-
-        # Create an spaceship and find the number of spaceships in a row.
-        # Spacing between each spaceship is equal to one spaceship width.
-        spaceship = SpaceShip(self)
-        spaceship_width, spaceship_height = spaceship.rect.size
-
-        # Calculate the number of spaceships in a row
-        # (2 * spaceship_width) creates margins on either side of a screen
-        available_space_x = self.settings.screen_width - (2 * spaceship_width)
-        number_spaceships_x = available_space_x // (2 * spaceship_width)
-        
-        # Determine the number of rows of spaceships that fit on the screen.
-        rocket_height = self.rocket.rect.height
-        available_space_y = (self.settings.screen_height -
-                                (18 * spaceship_height) - rocket_height)
-        number_rows = available_space_y // (2 * spaceship_height)
-        
-        # Create the full fleet of spaceships.
-        for row_number in range(number_rows):
-            for spaceship_number in range(number_spaceships_x):
-                self._create_spaceship(spaceship_number, row_number)
-
-    def _create_spaceship(self, spaceship_number, row_number):
-        """Create an spaceship and place it in the row."""
-        spaceship = SpaceShip(self)
-        spaceship_width, spaceship_height = spaceship.rect.size
-        spaceship.x = spaceship_width + 2 * spaceship_width * spaceship_number
-        spaceship.rect.x = spaceship.x
-        spaceship.rect.y = 3.5 * spaceship.rect.height + 2 * spaceship.rect.height * row_number
-        self.spaceships.add(spaceship)
-
-    def _check_fleet_edges(self):
         """
-        If any spaceship touches screen's edges,
-        then change the direction of a fleet.
+        Create the fleet of spaceships. The layout is computed for the
+        first fleet only; later fleets copy it.
         """
-        for spaceship in self.spaceships.sprites():
-            if spaceship.check_edges():
-                self._change_fleet_direction()
-                break
-            
-    def _change_fleet_direction(self):
-        """Drop the entire fleet and change the fleet's direction."""
-        for spaceship in self.spaceships.sprites():
-            spaceship.rect.y += self.settings.fleet_drop_speed
-        self.settings.fleet_direction *= -1
+        spaceship_width, spaceship_height = self.sprites.size('spaceship')
+        formation = grid_formation(
+            self.settings.screen_width, self.settings.screen_height,
+            spaceship_width, spaceship_height, self.rocket.rect.height)
+        self.spaceships.spawn(formation)
 
     def _update_screen(self):
         """Update images on the screen, and flip to the new screen."""
-        self.screen.fill(self.settings.bg_color)
+        renderer = self.renderer
+        renderer.begin_frame()
+        alpha = self._interpolation_alpha()
 
         # Draw a rocket
-        self.rocket.blitme()
+        renderer.add(self.rocket.blitme(alpha))
 
         # Draw bullets
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
+        renderer.extend(self.bullets.draw(alpha))
 
         # Draw spaceships
-        self.spaceships.draw(self.screen)
+        renderer.add(self.spaceships.draw(self.screen, alpha))
+
+        self.profiler.mark('render')
 
         # Draw the score information.
-        self.scoreboard.show_score()
+        renderer.extend(self.scoreboard.show_score())
+        self.profiler.mark('scoreboard')
 
         # Draw the play button if the game is inactive.
         if not self.stats.game_active:
-            self.start_button.draw_button()
-
-        pygame.display.flip()
+            renderer.add(self.start_button.draw_button())
+
+        # Draw the performance overlay if it is shown.
+        if self.perf_overlay.visible:
+            renderer.add(self.perf_overlay.draw())
+        self.profiler.mark('render')
+
+        # Waiting for the vertical sync is not work the governor can
+        # cut, so with vsync the frame is timed before presenting it.
+        vsync = self.settings.vsync
+        if self.governor and vsync:
+            self._govern_quality()
+        renderer.end_frame()
+        self.profiler.mark('flip')
+        if self.governor and not vsync:
+            self._govern_quality()
+
+    def _govern_quality(self):
+        """
+        Finish timing the frame, and change the quality of the next
+        ones if the governor asks for it.
+        """
+        governor = self.governor
+        level = governor.end_frame()
+        if level is None:
+            return
+
+        settings = self.settings
+        refresh_interval = 1
+        if level >= governor.THROTTLE_HUD:
+            refresh_interval = settings.hud_refresh_interval
+        self.scoreboard.set_refresh_interval(refresh_interval)
+
+        render_mode = settings.render_mode
+        if level >= governor.DIRTY_RECTS:
+            render_mode = 'dirty'
+        if self.renderer.mode != render_mode:
+            self.renderer.set_mode(render_mode)
+
+        scale = settings.render_scale
+        if level >= governor.LOW_SCALE:
+            scale *= settings.low_quality_scale
+        if scale != self.render_scale:
+            self._set_render_scale(scale)
+
+        print(json.dumps({'quality': {
+            'level': governor.level_name,
+            'frame_ms': round(governor.frame_time * 1000, 2),
+            'budget_ms': round(governor.budget * 1000, 2),
+            'render_scale': self.render_scale,
+        }}), file=sys.stderr)
+
+    def _interpolation_alpha(self):
+        """
+        Return how far between the last two ticks moving objects
+        are drawn. Nothing moves while the game is paused or over.
+        """
+        if (self.settings.interpolate
+                and self.stats.state == self.stats.PLAYING):
+            if self.simulation:
+                return self.simulation.alpha()
+            return self.clock.alpha
+        return 1.0
 
 
 if __name__ == '__main__':
@@ -0,0 +1,474 @@
+"""
+Serve a running game to spectators over local sockets, and watch it
+from another window.
+
+    python spectator.py 127.0.0.1:8765
+    python spectator.py /tmp/space_battle.sock
+"""
+import argparse
+import asyncio
+from itertools import repeat
+import os
+import struct
+import threading
+
+import numpy as np
+import pygame
+
+from assets import Assets
+from fonts import FontCache
+from game_stats import GameStats
+from glyph_cache import GlyphCache, GlyphText
+from settings import Settings
+
+
+# Every message is framed by its length. A message is a keyframe with
+# the whole scene, or a delta with what changed in one tick.
+_FRAME = struct.Struct('<I')
+KEYFRAME, DELTA = 1, 2
+
+# A keyframe is its header, the HUD, then the fleet's x and y without
+# its offset (float64), its alive flags (bool) and the bullets.
+_KEYFRAME = struct.Struct(
+    '<BQd'     # message kind, tick, seconds per tick
+    'dd'       # rocket x and y
+    'ddII'     # fleet offset x and y, number of spaceships, of bullets
+)
+_HUD = struct.Struct('<qqiiBd')  # score, high score, level, rockets
+                                 # left, state, bullet speed
+BULLET = np.dtype([('serial', '<u4'), ('x', '<f8'), ('y', '<f8')])
+
+# A delta is its header, then the sections its flags name, in order.
+_DELTA = struct.Struct('<BQB')   # message kind, tick, flags
+FLEET_MOVED, SHIPS_KILLED, BULLETS_ADDED, BULLETS_REMOVED = 1, 2, 4, 8
+ROCKET_MOVED, HUD_CHANGED = 16, 32
+_PAIR = struct.Struct('<dd')
+_COUNT = struct.Struct('<I')
+
+STATES = (GameStats.PLAYING, GameStats.ROCKET_DESTROYED,
+          GameStats.LEVEL_TRANSITION, GameStats.GAME_OVER)
+
+
+def parse_address(text):
+    """Return 'host:port' as a (host, port) tuple, or text as a socket path."""
+    host, _, port = text.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return text
+
+
+def _hud(sb_game):
+    """Return what the scoreboard shows, as a tuple."""
+    stats = sb_game.stats
+    return (stats.score, stats.high_score, stats.level, stats.rockets_left,
+            STATES.index(stats.state), sb_game.settings.bullet_speed)
+
+
+class SpectatorServer:
+    """
+    A class to stream a game to any number of spectators.
+
+    The game calls publish() once per tick. It sends a keyframe when a
+    spectator joins or a new fleet appears, and otherwise a delta with
+    only what changed: the fleet's offset (the fleet moves as one),
+    spaceships destroyed, bullets added and removed, the rocket and the
+    scoreboard. The same bytes go to every spectator, from an asyncio
+    loop on its own thread. A spectator that falls too far behind is
+    disconnected rather than slowing the game.
+    """
+
+    def __init__(self, address, buffer_limit=1 << 20):
+        """
+        Start serving on address: a (host, port) tuple for TCP, or a
+        path for a Unix socket. Port 0 picks a free port.
+        """
+        self.address = address
+        self.buffer_limit = buffer_limit
+        self.ticks = 0
+
+        # Spectators that have had a keyframe, and ones waiting for one.
+        self._clients = set()
+        self._pending = set()
+        self._keyframe_wanted = False
+
+        # The scene as last sent, to find what changed.
+        self._generation = None
+        self._offset = None
+        self._alive = None
+        self._count = 0
+        self._bullets = set()
+        self._rocket = None
+        self._hud = None
+
+        self._loop = asyncio.new_event_loop()
+        self._error = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve,
+                                        name='spectator-server', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+
+    def publish(self, sb_game):
+        """Send the tick sb_game just simulated to the spectators."""
+        self.ticks += 1
+        if not self._clients and not self._pending:
+            return
+        keyframe = (self._keyframe_wanted
+                    or sb_game.spaceships.generation != self._generation)
+        if keyframe:
+            self._keyframe_wanted = False
+            payload = self._keyframe(sb_game)
+        else:
+            payload = self._delta(sb_game)
+        self._loop.call_soon_threadsafe(
+            self._send, _FRAME.pack(len(payload)) + payload, keyframe)
+
+    def close(self):
+        """Disconnect every spectator and stop serving."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _keyframe(self, sb_game):
+        """Return the whole scene, and remember it as sent."""
+        fleet = sb_game.spaceships
+        rocket = sb_game.rocket
+        bullets = sb_game.bullets.active
+        self._generation = fleet.generation
+        self._offset = (fleet.offset_x, fleet.offset_y)
+        self._alive = fleet.alive.copy()
+        self._count = fleet.count
+        self._bullets = {bullet.serial for bullet in bullets}
+        self._rocket = (rocket.x, rocket.y)
+        self._hud = _hud(sb_game)
+
+        bullet_state = np.array([(b.serial, b.rect.x, b.y) for b in bullets],
+                                dtype=BULLET)
+        return b''.join((
+            _KEYFRAME.pack(KEYFRAME, self.ticks, sb_game.clock.dt,
+                           rocket.x, rocket.y, fleet.offset_x, fleet.offset_y,
+                           len(fleet.x), len(bullets)),
+            _HUD.pack(*self._hud),
+            (fleet.x - fleet.offset_x).tobytes(),
+            (fleet.y - fleet.offset_y).tobytes(),
+            fleet.alive.tobytes(),
+            bullet_state.tobytes()))
+
+    def _delta(self, sb_game):
+        """Return what changed since the last message, and remember it."""
+        fleet = sb_game.spaceships
+        rocket = sb_game.rocket
+        flags = 0
+        parts = []
+
+        offset = (fleet.offset_x, fleet.offset_y)
+        if offset != self._offset:
+            self._offset = offset
+            flags |= FLEET_MOVED
+            parts.append(_PAIR.pack(*offset))
+
+        # Spaceships are only compared when some were destroyed.
+        if fleet.count != self._count:
+            killed = np.flatnonzero(self._alive & ~fleet.alive)
+            self._alive[killed] = False
+            self._count = fleet.count
+            flags |= SHIPS_KILLED
+            parts.append(_COUNT.pack(len(killed)))
+            parts.append(killed.astype('<u4').tobytes())
+
+        bullets = sb_game.bullets.active
+        serials = {bullet.serial for bullet in bullets}
+        if serials != self._bullets:
+            added = [(b.serial, b.rect.x, b.y) for b in bullets
+                     if b.serial not in self._bullets]
+            removed = self._bullets - serials
+            self._bullets = serials
+            if added:
+                flags |= BULLETS_ADDED
+                parts.append(_COUNT.pack(len(added)))
+                parts.append(np.array(added, dtype=BULLET).tobytes())
+            if removed:
+                flags |= BULLETS_REMOVED
+                parts.append(_COUNT.pack(len(removed)))
+                parts.append(np.array(sorted(removed), '<u4').tobytes())
+
+        position = (rocket.x, rocket.y)
+        if position != self._rocket:
+            self._rocket = position
+            flags |= ROCKET_MOVED
+            parts.append(_PAIR.pack(*position))
+
+        hud = _hud(sb_game)
+        if hud != self._hud:
+            self._hud = hud
+            flags |= HUD_CHANGED
+            parts.append(_HUD.pack(*hud))
+
+        return _DELTA.pack(DELTA, self.ticks, flags) + b''.join(parts)
+
+    def _serve(self):
+        """Run the server's event loop until close() stops it."""
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            if isinstance(self.address, str):
+                server = loop.run_until_complete(asyncio.start_unix_server(
+                    self._on_client, self.address))
+            else:
+                server = loop.run_until_complete(asyncio.start_server(
+                    self._on_client, *self.address))
+        except OSError as error:
+            self._error = error
+            self._ready.set()
+            return
+        self.address = server.sockets[0].getsockname()
+        self._ready.set()
+
+        loop.run_forever()
+        for writer in self._clients | self._pending:
+            writer.close()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+        if isinstance(self.address, str):
+            os.remove(self.address)
+
+    async def _on_client(self, reader, writer):
+        """Send the next keyframe to a new spectator, then keep it posted."""
+        self._pending.add(writer)
+        self._keyframe_wanted = True
+
+        # Spectators only listen; wait for them to hang up.
+        try:
+            await reader.read()
+        except ConnectionError:
+            pass
+        self._drop(writer)
+
+    def _drop(self, writer):
+        """Stop sending to a spectator."""
+        self._clients.discard(writer)
+        self._pending.discard(writer)
+        writer.close()
+
+    def _send(self, frame, keyframe):
+        """Send a message to every spectator that can follow it."""
+        if keyframe:
+            self._clients |= self._pending
+            self._pending.clear()
+        for writer in list(self._clients):
+            if (writer.is_closing() or writer.transport
+                    .get_write_buffer_size() > self.buffer_limit):
+                self._drop(writer)
+            else:
+                writer.write(frame)
+
+
+class SpectatorScene:
+    """
+    A class to rebuild a game's scene from a spectator stream.
+    Bullets only move straight up at the bullet speed, so they are
+    moved here on every tick instead of being sent.
+    """
+
+    def __init__(self):
+        """Initialize an empty scene that waits for a keyframe."""
+        self.synced = False
+        self.ticks = 0
+        self.dt = 0.0
+        self.score = self.high_score = 0
+        self.level = 1
+        self.rockets_left = 0
+        self.state = GameStats.GAME_OVER
+        self.bullet_speed = 0.0
+        self.rocket_x = self.rocket_y = 0.0
+        self.offset_x = self.offset_y = 0.0
+        self.base_x = self.base_y = np.empty(0)
+        self.alive = np.empty(0, dtype=bool)
+        self.bullets = {}
+
+    def apply(self, message):
+        """Update the scene from one message of the stream."""
+        if message[0] == KEYFRAME:
+            self._apply_keyframe(message)
+        elif message[0] == DELTA and self.synced:
+            self._apply_delta(message)
+
+    def fleet_positions(self):
+        """Return the x and y arrays of the living spaceships."""
+        return (self.base_x[self.alive] + self.offset_x,
+                self.base_y[self.alive] + self.offset_y)
+
+    def _set_hud(self, message, offset):
+        """Read the scoreboard at offset, and return where it ends."""
+        (self.score, self.high_score, self.level, self.rockets_left,
+         state, self.bullet_speed) = _HUD.unpack_from(message, offset)
+        self.state = STATES[state]
+        return offset + _HUD.size
+
+    def _apply_keyframe(self, message):
+        """Replace the whole scene."""
+        (_, self.ticks, self.dt, self.rocket_x, self.rocket_y,
+         self.offset_x, self.offset_y, ships,
+         bullets) = _KEYFRAME.unpack_from(message)
+        offset = self._set_hud(message, _KEYFRAME.size)
+        self.base_x = np.frombuffer(message, np.float64, ships, offset)
+        offset += 8 * ships
+        self.base_y = np.frombuffer(message, np.float64, ships, offset)
+        offset += 8 * ships
+        self.alive = np.frombuffer(message, np.bool_, ships, offset).copy()
+        offset += ships
+        self.bullets = {int(serial): [x, y] for serial, x, y in
+                        np.frombuffer(message, BULLET, bullets, offset)
+                        .tolist()}
+        self.synced = True
+
+    def _apply_delta(self, message):
+        """Advance the scene by one tick."""
+        _, self.ticks, flags = _DELTA.unpack_from(message)
+        offset = _DELTA.size
+
+        # Bullets moved during the tick if the game was being played.
+        if self.state == GameStats.PLAYING:
+            step = self.bullet_speed * self.dt
+            for bullet in self.bullets.values():
+                bullet[1] -= step
+
+        if flags & FLEET_MOVED:
+            self.offset_x, self.offset_y = _PAIR.unpack_from(message, offset)
+            offset += _PAIR.size
+        if flags & SHIPS_KILLED:
+            (count,) = _COUNT.unpack_from(message, offset)
+            offset += _COUNT.size
+            self.alive[np.frombuffer(message, '<u4', count, offset)] = False
+            offset += 4 * count
+        if flags & BULLETS_ADDED:
+            (count,) = _COUNT.unpack_from(message, offset)
+            offset += _COUNT.size
+            for serial, x, y in np.frombuffer(message, BULLET, count,
+                                              offset).tolist():
+                self.bullets[serial] = [x, y]
+            offset += BULLET.itemsize * count
+        if flags & BULLETS_REMOVED:
+            (count,) = _COUNT.unpack_from(message, offset)
+            offset += _COUNT.size
+            for serial in np.frombuffer(message, '<u4', count,
+                                        offset).tolist():
+                self.bullets.pop(serial, None)
+            offset += 4 * count
+        if flags & ROCKET_MOVED:
+            self.rocket_x, self.rocket_y = _PAIR.unpack_from(message, offset)
+            offset += _PAIR.size
+        if flags & HUD_CHANGED:
+            self._set_hud(message, offset)
+
+
+async def read_stream(address, scene):
+    """Apply every message from the server at address to scene."""
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+    try:
+        while True:
+            (length,) = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+            scene.apply(await reader.readexactly(length))
+    except asyncio.IncompleteReadError:
+        # The game has ended the stream.
+        pass
+    finally:
+        writer.close()
+
+
+class SpectatorView:
+    """A class to draw a spectator scene in its own window."""
+
+    def __init__(self, scene):
+        """Open the window and load the sprites and fonts."""
+        self.scene = scene
+
+        # The spectator only draws, so it needs no audio.
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        pygame.display.init()
+        pygame.font.init()
+        self.settings = Settings()
+        self.screen = pygame.display.set_mode(
+            (self.settings.screen_width, self.settings.screen_height))
+        pygame.display.set_caption("Space Battle - Spectator")
+
+        self.sprites = Assets().atlas('sprites', ('spaceship', 'rocket'))
+        self.sheet = self.sprites.surface
+        self.spaceship_area = self.sprites.region('spaceship')
+        self.rocket_area = self.sprites.region('rocket')
+
+        font = FontCache(self.settings.font_cache_path).font(
+            "Times New Roman", 48)
+        glyphs = GlyphCache(font, (255, 255, 255), self.settings.bg_color)
+        self.score_text = GlyphText(glyphs)
+        self.high_score_text = GlyphText(glyphs)
+        self.level_text = GlyphText(glyphs)
+
+    def draw(self):
+        """Draw the scene as it is now, and flip to it."""
+        scene = self.scene
+        screen = self.screen
+        screen.fill(self.settings.bg_color)
+        if scene.synced:
+            x, y = scene.fleet_positions()
+            screen.blits(zip(repeat(self.sheet), zip(x.tolist(), y.tolist()),
+                             repeat(self.spaceship_area)), False)
+            for bullet_x, bullet_y in scene.bullets.values():
+                screen.fill(self.settings.bullet_color,
+                            (bullet_x, bullet_y, self.settings.bullet_width,
+                             self.settings.bullet_height))
+            screen.blit(self.sheet, (scene.rocket_x, scene.rocket_y),
+                        self.rocket_area)
+            self._draw_hud()
+        pygame.display.flip()
+
+    def _draw_hud(self):
+        """Draw the scores, level and rockets left like the scoreboard."""
+        scene = self.scene
+        screen_rect = self.screen.get_rect()
+        score = self.score_text.render("{:,}".format(round(scene.score, -1)))
+        score_rect = score.get_rect(top=20, right=screen_rect.right - 20)
+        high_score = self.high_score_text.render(
+            "{:,}".format(round(scene.high_score, -1)))
+        level = self.level_text.render(str(scene.level))
+        self.screen.blit(score, score_rect)
+        self.screen.blit(high_score, high_score.get_rect(
+            top=20, centerx=screen_rect.centerx))
+        self.screen.blit(level, level.get_rect(
+            top=score_rect.bottom + 10, right=score_rect.right))
+        width = self.rocket_area.width
+        self.screen.blits([(self.sheet, (10 + i * width, 10), self.rocket_area)
+                           for i in range(scene.rockets_left)])
+
+
+async def watch(address, frame_rate=60):
+    """Draw the game served at address until it ends or the window closes."""
+    scene = SpectatorScene()
+    view = SpectatorView(scene)
+    stream = asyncio.ensure_future(read_stream(address, scene))
+    try:
+        while not stream.done():
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            view.draw()
+            await asyncio.sleep(1 / frame_rate)
+    finally:
+        stream.cancel()
+
+
+def main(argv=None):
+    """Watch the game served at the address given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('address',
+                        help="host:port of the game, or its Unix socket path")
+    args = parser.parse_args(argv)
+    asyncio.run(watch(parse_address(args.address)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Play many headless games for every combination of settings in a grid,
+across all cores, and stream the results of each combination as JSON
+lines as soon as its games are done.
+
+    python sweep.py --set speedup_scale=1.1,1.3,1.5 --set fleet_drop_speed=5,10
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Before pygame, so its greeting stays out of the JSON lines.
+from headless import use_dummy_drivers
+
+import numpy as np
+
+from autopilot import Autopilot
+from settings import Settings
+from space_battle import SpaceBattle
+
+# The game runs without a window.
+use_dummy_drivers()
+
+
+# One game per worker process, reused for every game it plays.
+_game = None
+
+
+def _parse_value(text):
+    """Return text as an int or float if it is one, else as a string."""
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_grid(assignments):
+    """
+    Turn 'name=v1,v2' strings into a list of dictionaries, one for
+    every combination of values.
+    """
+    names = []
+    values = []
+    for assignment in assignments:
+        name, _, options = assignment.partition('=')
+        names.append(name)
+        values.append([_parse_value(v) for v in options.split(',')])
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def play_game(game, overrides, seed, max_ticks):
+    """Play one game with the autopilot and return how it went."""
+    game.settings.__init__()
+    game._start_new_game()
+
+    # Dynamic settings were just reset, so apply the overrides after.
+    for name, value in overrides.items():
+        setattr(game.settings, name, value)
+
+    player = Autopilot(game, seed)
+    stats = game.stats
+    dt = game.clock.dt
+    ticks = 0
+    while stats.game_active and ticks < max_ticks:
+        player.act()
+        game._update_positions(dt)
+        ticks += 1
+    return {'level': stats.level, 'score': stats.score,
+            'seconds': ticks * dt, 'game_over': not stats.game_active}
+
+
+def _play_games(overrides, seeds, max_ticks):
+    """Play a batch of games in a worker process."""
+    global _game
+    if _game is None:
+        _game = SpaceBattle(headless=True)
+    return [play_game(_game, overrides, seed, max_ticks) for seed in seeds]
+
+
+def _aggregate(overrides, games):
+    """Return the mean and spread of the results of one configuration."""
+    levels = np.array([g['level'] for g in games])
+    scores = np.array([g['score'] for g in games])
+    seconds = np.array([g['seconds'] for g in games])
+    over = np.array([g['game_over'] for g in games])
+    return {
+        'settings': overrides,
+        'games': len(games),
+        'mean_level': float(levels.mean()),
+        'mean_score': float(scores.mean()),
+        'std_score': float(scores.std()),
+        # Games still running at the time limit count at the limit.
+        'mean_seconds_to_game_over': float(seconds.mean()),
+        'game_over_rate': float(over.mean()),
+    }
+
+
+def sweep(grid, games, max_ticks, workers=None, batch=4):
+    """
+    Play games games for every configuration in grid, and yield each
+    configuration's aggregated results as soon as they are complete.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for index, overrides in enumerate(grid):
+            for first in range(0, games, batch):
+                seeds = range(first, min(first + batch, games))
+                future = pool.submit(_play_games, overrides, list(seeds),
+                                     max_ticks)
+                futures[future] = index
+
+        results = [[] for _ in grid]
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index].extend(future.result())
+            if len(results[index]) == games:
+                yield _aggregate(grid[index], results[index])
+
+
+def main(argv=None):
+    """Run the sweep given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='NAME=V1,V2',
+                        help="values to try for a Settings attribute "
+                             "(may be repeated)")
+    parser.add_argument('--games', type=int, default=16,
+                        help="games per configuration")
+    parser.add_argument('--max-minutes', type=float, default=10.0,
+                        help="game time after which a game is stopped")
+    parser.add_argument('--workers', type=int,
+                        help="worker processes (default: one per core)")
+    parser.add_argument('--output', help="also append JSON lines here")
+    args = parser.parse_args(argv)
+
+    grid = parse_grid(args.set)
+    max_ticks = int(args.max_minutes * 60 * Settings().tick_rate)
+
+    start = time.perf_counter()
+    output = open(args.output, 'a') if args.output else None
+    for result in sweep(grid, args.games, max_ticks, args.workers):
+        line = json.dumps(result)
+        print(line, flush=True)
+        if output:
+            output.write(line + '\n')
+            output.flush()
+    if output:
+        output.close()
+    print(f"{len(grid)} configurations in "
+          f"{time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""
+Record gameplay events for per-session analytics, and summarize the
+recorded files.
+
+    python telemetry.py telemetry/
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+
+# Kinds of events. Each event also has the level it happened on, the
+# seconds since the session started and one value:
+# SHOT: bullets in flight after firing
+# KILL: spaceships destroyed by one tick's bullets
+# LIFE_LOST: the score when the rocket was hit
+# LEVEL: seconds of play the finished level took
+SHOT, KILL, LIFE_LOST, LEVEL = range(1, 5)
+
+EVENT = np.dtype([('kind', '<u1'), ('level', '<u2'), ('time', '<f8'),
+                  ('value', '<f8')])
+
+# Each file starts with a magic number, a format version and the
+# session it belongs to (the time it started, in microseconds).
+MAGIC = b'SBTL'
+VERSION = 1
+_HEADER = struct.Struct('<4sBQ')
+
+
+class Telemetry:
+    """
+    A class to record gameplay events without slowing the game.
+
+    Events are written into preallocated batches. A full batch is
+    handed to a background thread that compresses it into the current
+    file, starting a new file when that one is big enough and
+    deleting the oldest files beyond max_files. If the writer falls
+    behind, whole batches are dropped and counted instead of waiting.
+    """
+
+    def __init__(self, directory, batch_size=1024, batches=8,
+                 file_bytes=1 << 20, max_files=20):
+        """Start a session that writes its files into directory."""
+        self.directory = directory
+        self.file_bytes = file_bytes
+        self.max_files = max_files
+        self.started = time.monotonic()
+        self.session = int(time.time() * 1e6)
+
+        # Events that could not be handed to the writer.
+        self.dropped = 0
+
+        # Every batch is allocated up front; the writer returns each
+        # one to the free queue once it is on disk.
+        self._free = queue.SimpleQueue()
+        for _ in range(batches - 1):
+            self._free.put(np.empty(batch_size, EVENT))
+        self._batch = np.empty(batch_size, EVENT)
+        self._count = 0
+        self._full = queue.Queue(batches)
+
+        os.makedirs(directory, exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop,
+                                        name='telemetry-writer', daemon=True)
+        self._writer.start()
+
+    def record(self, kind, level, value=0.0):
+        """Add an event. Never blocks."""
+        self._batch[self._count] = (kind, level,
+                                    time.monotonic() - self.started, value)
+        self._count += 1
+        if self._count == len(self._batch):
+            self.flush()
+
+    def flush(self):
+        """Hand the events recorded so far to the writer."""
+        if not self._count:
+            return
+        try:
+            batch = self._free.get_nowait()
+        except queue.Empty:
+            # Every batch is waiting to be written: drop this one.
+            self.dropped += self._count
+            self._count = 0
+            return
+        self._full.put_nowait((self._batch, self._count))
+        self._batch = batch
+        self._count = 0
+
+    def close(self):
+        """Write every recorded event to disk and stop the writer."""
+        self.flush()
+        self._full.put(None)
+        self._writer.join()
+
+    def _write_loop(self):
+        """Compress batches into rotated files, on a thread."""
+        sequence = 0
+        out = None
+        written = 0
+        while True:
+            item = self._full.get()
+            if item is None:
+                break
+            batch, count = item
+            if out is None or written >= self.file_bytes:
+                if out is not None:
+                    out.close()
+                out = self._open(sequence)
+                sequence += 1
+                written = 0
+            data = batch[:count].tobytes()
+            out.write(data)
+            out.flush(zlib.Z_SYNC_FLUSH)
+            written += len(data)
+            self._free.put(batch)
+        if out is not None:
+            out.close()
+
+    def _open(self, sequence):
+        """Start the next file, deleting the oldest ones beyond max_files."""
+        path = os.path.join(self.directory,
+                            f'{self.session}-{sequence:05d}.sbt.gz')
+        out = gzip.open(path, 'wb')
+        out.write(_HEADER.pack(MAGIC, VERSION, self.session))
+        files = sorted(glob.glob(os.path.join(self.directory, '*.sbt.gz')))
+        for old in files[:-self.max_files]:
+            os.remove(old)
+        return out
+
+
+def _decompress(path, read_size):
+    """
+    Yield the contents of a gzip file as they are decompressed. A file
+    that is still being written, or was cut off, has no end marker;
+    it is read up to where it ends.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    with open(path, 'rb') as f:
+        while not decompressor.eof:
+            data = f.read(read_size)
+            if not data:
+                return
+            try:
+                yield decompressor.decompress(data)
+            except zlib.error:
+                # A damaged end holds no more whole events.
+                return
+
+
+def read_events(paths, read_size=1 << 16):
+    """
+    Yield (session, events) for chunks of the events in the given
+    files and directories, oldest file first. Files that are still
+    being written, or were cut off, yield every whole event in them.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, '*.sbt.gz')))
+        else:
+            files.append(path)
+    for path in sorted(files):
+        session = None
+        pending = b''
+        for data in _decompress(path, read_size):
+            pending += data
+            if session is None:
+                if len(pending) < _HEADER.size:
+                    continue
+                magic, version, session = _HEADER.unpack_from(pending)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(
+                        f"{path}: not a Space Battle telemetry file")
+                pending = pending[_HEADER.size:]
+
+            # Yield the whole events, and keep a partial one for later.
+            usable = len(pending) - len(pending) % EVENT.itemsize
+            if usable:
+                yield session, np.frombuffer(pending[:usable], EVENT)
+                pending = pending[usable:]
+
+
+def summarize(paths):
+    """Return totals for every session in the given files."""
+    sessions = {}
+    for session, events in read_events(paths):
+        totals = sessions.setdefault(session, {
+            'shots': 0, 'kills': 0, 'lives_lost': 0, 'levels': 0,
+            'level_seconds': 0.0, 'seconds': 0.0})
+        kinds = events['kind']
+        totals['shots'] += int(np.count_nonzero(kinds == SHOT))
+        totals['kills'] += int(events['value'][kinds == KILL].sum())
+        totals['lives_lost'] += int(np.count_nonzero(kinds == LIFE_LOST))
+        levels = events['value'][kinds == LEVEL]
+        totals['levels'] += len(levels)
+        totals['level_seconds'] += float(levels.sum())
+        totals['seconds'] = max(totals['seconds'], float(events['time'].max()))
+
+    for totals in sessions.values():
+        level_seconds = totals.pop('level_seconds')
+        totals['mean_level_seconds'] = (level_seconds / totals['levels']
+                                        if totals['levels'] else None)
+        totals['accuracy'] = (totals['kills'] / totals['shots']
+                              if totals['shots'] else None)
+    return sessions
+
+
+def main(argv=None):
+    """Print per-session totals for the given telemetry files as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='+',
+                        help="telemetry files or directories")
+    args = parser.parse_args(argv)
+    print(json.dumps(summarize(args.paths), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The game runs without a window or sound in the tests.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# The game's modules live at the top of the repository.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,41 @@
+import governor
+from governor import QualityGovernor
+from settings import Settings
+
+
+def _run(monkeypatch, quality, cost, frames):
+    """Time frames frames of cost seconds, and return the level changes."""
+    now = [0.0]
+    monkeypatch.setattr(governor, 'perf_counter', lambda: now[0])
+    changes = []
+    for _ in range(frames):
+        quality.begin_frame()
+        now[0] += cost
+        level = quality.end_frame()
+        if level is not None:
+            changes.append(level)
+    return changes
+
+
+def test_skips_dirty_rects_when_already_dirty(monkeypatch):
+    settings = Settings()
+    settings.render_mode = 'dirty'
+    quality = QualityGovernor(settings)
+
+    changes = _run(monkeypatch, quality, quality.budget * 2, 200)
+    assert changes == [QualityGovernor.THROTTLE_HUD,
+                       QualityGovernor.LOW_SCALE]
+
+    changes = _run(monkeypatch, quality, 0.0, 2000)
+    assert changes == [QualityGovernor.THROTTLE_HUD, QualityGovernor.FULL]
+
+
+def test_steps_through_every_level_when_full(monkeypatch):
+    settings = Settings()
+    settings.render_mode = 'full'
+    quality = QualityGovernor(settings)
+
+    changes = _run(monkeypatch, quality, quality.budget * 2, 200)
+    assert changes == [QualityGovernor.THROTTLE_HUD,
+                       QualityGovernor.DIRTY_RECTS,
+                       QualityGovernor.LOW_SCALE]
@@ -0,0 +1,53 @@
+import os
+
+from leaderboard import Leaderboard
+
+
+def _fill(path, scores):
+    """Record a game for each score in the leaderboard at path."""
+    leaderboard = Leaderboard(path, index_every=1)
+    for score in scores:
+        leaderboard.record(score, 1)
+    leaderboard.close()
+
+
+def test_reads_games_logged_after_index(tmp_path):
+    path = str(tmp_path / 'leaderboard.dat')
+    _fill(path, [30, 10])
+    _fill(path, [20])
+
+    top = Leaderboard(path)
+    top.close()
+    assert [entry[0] for entry in top.top] == [30, 20, 10]
+
+
+def test_ignores_index_beyond_cut_log(tmp_path):
+    path = str(tmp_path / 'leaderboard.dat')
+    _fill(path, [30, 10, 20])
+    with open(path, 'r+b') as f:
+        f.truncate(Leaderboard.RECORD.size)
+
+    leaderboard = Leaderboard(path)
+    leaderboard.record(5, 1)
+    leaderboard.close()
+    assert [entry[0] for entry in leaderboard.top] == [30, 5]
+    assert os.path.getsize(path) == 2 * Leaderboard.RECORD.size
+
+    reloaded = Leaderboard(path)
+    reloaded.close()
+    assert [entry[0] for entry in reloaded.top] == [30, 5]
+
+
+def test_ignores_index_of_deleted_log(tmp_path):
+    path = str(tmp_path / 'leaderboard.dat')
+    _fill(path, [30, 10])
+    os.remove(path)
+
+    leaderboard = Leaderboard(path)
+    assert leaderboard.top == []
+    leaderboard.record(5, 1)
+    leaderboard.close()
+
+    reloaded = Leaderboard(path)
+    reloaded.close()
+    assert [entry[0] for entry in reloaded.top] == [5]
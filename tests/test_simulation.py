@@ -0,0 +1,66 @@
+import time
+
+import pygame
+import pytest
+
+from replay import replay
+from settings import Settings
+from space_battle import SpaceBattle
+
+
+@pytest.fixture
+def threaded_recording(tmp_path, monkeypatch):
+    """Return the path a threaded game records to."""
+    path = str(tmp_path / 'session.sbin')
+    init = Settings.__init__
+
+    def settings_init(settings):
+        init(settings)
+        settings.record_path = path
+        settings.threaded = True
+        settings.leaderboard_path = None
+        settings.telemetry_dir = None
+
+    monkeypatch.setattr(Settings, '__init__', settings_init)
+    return path
+
+
+def _frame(game, *events):
+    """Post events, then handle them and show the simulation's state."""
+    for event in events:
+        pygame.event.post(event)
+    game._check_key_mouse_events()
+    time.sleep(game.clock.dt)
+    game._sync_simulation()
+
+
+def _key(kind, key):
+    return pygame.event.Event(kind, key=key)
+
+
+def test_threaded_recording_replays(threaded_recording):
+    game = SpaceBattle()
+    game._start_simulation()
+    sim_game = game.simulation.sim_game
+
+    _frame(game, pygame.event.Event(
+        pygame.MOUSEBUTTONDOWN, pos=game.start_button.rect.center,
+        button=1))
+    for i in range(60):
+        key = (pygame.K_LEFT, pygame.K_RIGHT)[i // 20 % 2]
+        _frame(game, _key(pygame.KEYDOWN, key),
+               _key(pygame.KEYDOWN, pygame.K_SPACE))
+        _frame(game, _key(pygame.KEYUP, key),
+               _key(pygame.KEYUP, pygame.K_SPACE))
+    assert game.stats.game_active
+
+    with pytest.raises(SystemExit):
+        game._quit()
+
+    replayed = SpaceBattle(headless=True)
+    result = replay(threaded_recording, replayed)
+    assert result['ticks'] == sim_game.clock.ticks
+    assert ((replayed.rocket.x, replayed.rocket.y)
+            == (sim_game.rocket.x, sim_game.rocket.y))
+    assert (replayed.spaceships.alive == sim_game.spaceships.alive).all()
+    assert replayed.stats.score == sim_game.stats.score
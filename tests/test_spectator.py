@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from autopilot import Autopilot
+from space_battle import SpaceBattle
+from spectator import SpectatorScene, SpectatorServer, read_stream
+
+
+def _wait_for(scene, server):
+    """Wait until scene has caught up with every tick server sent."""
+    deadline = time.monotonic() + 5
+    while not scene.synced or scene.ticks != server.ticks:
+        assert time.monotonic() < deadline, "spectator did not catch up"
+        time.sleep(0.001)
+
+
+def _assert_matches(scene, game):
+    """Check the spectator's scene against the game it watches."""
+    fleet = game.spaceships
+    x, y = scene.fleet_positions()
+    assert np.allclose(x, fleet.x[fleet.alive])
+    assert np.allclose(y, fleet.y[fleet.alive])
+    assert (sorted(map(tuple, scene.bullets.values()))
+            == sorted((bullet.rect.x, bullet.y)
+                      for bullet in game.bullets.active))
+    assert (scene.rocket_x, scene.rocket_y) == (game.rocket.x, game.rocket.y)
+    assert scene.score == game.stats.score
+    assert scene.level == game.stats.level
+    assert scene.rockets_left == game.stats.rockets_left
+    assert scene.state == game.stats.state
+
+
+@pytest.mark.parametrize('transport', ['tcp', 'unix'])
+def test_spectator_follows_game(tmp_path, transport):
+    if transport == 'tcp':
+        address = ('127.0.0.1', 0)
+    else:
+        address = str(tmp_path / 'space_battle.sock')
+    server = SpectatorServer(address)
+
+    game = SpaceBattle(headless=True)
+    game.spectators = server
+    player = Autopilot(game, seed=3)
+
+    scene = SpectatorScene()
+    client = threading.Thread(
+        target=asyncio.run, args=(read_stream(server.address, scene),))
+    client.start()
+    try:
+        # The spectator joins at the next keyframe after it connects.
+        deadline = time.monotonic() + 5
+        while not scene.synced:
+            assert time.monotonic() < deadline, "spectator never synced"
+            game._update_positions(game.clock.dt)
+            time.sleep(0.001)
+
+        for tick in range(3000):
+            if not game.stats.game_active:
+                game._press_play_button(game.start_button.field_rect.center)
+            player.act()
+            game._update_positions(game.clock.dt)
+            if tick % 10 == 0:
+                _wait_for(scene, server)
+                _assert_matches(scene, game)
+        assert game.stats.score > 0
+    finally:
+        server.close()
+        client.join(5)
+    assert not client.is_alive()
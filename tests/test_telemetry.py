@@ -0,0 +1,53 @@
+import os
+import shutil
+import time
+
+import numpy as np
+
+from telemetry import Telemetry, read_events, SHOT, KILL
+
+
+def _wait_for_writer(telemetry, batches):
+    """Wait until the writer has handed back every batch it was given."""
+    deadline = time.monotonic() + 5
+    while telemetry._free.qsize() < batches - 1:
+        assert time.monotonic() < deadline, "writer did not catch up"
+        time.sleep(0.01)
+
+
+def _read(path):
+    """Return every event read from path as one array."""
+    chunks = [events for _, events in read_events([str(path)])]
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+
+def test_reads_file_still_being_written(tmp_path):
+    telemetry = Telemetry(str(tmp_path), batch_size=100, batches=8)
+    for i in range(500):
+        telemetry.record(SHOT if i % 2 else KILL, 1, i)
+    _wait_for_writer(telemetry, 8)
+
+    # The writer has not closed the file, so it has no end marker.
+    events = _read(tmp_path)
+    assert len(events) == 500
+    assert events['value'].tolist() == list(range(500))
+
+    telemetry.close()
+    assert len(_read(tmp_path)) == 500
+
+
+def test_reads_whole_events_of_cut_off_file(tmp_path):
+    telemetry = Telemetry(str(tmp_path / 'full'), batch_size=100)
+    for i in range(500):
+        telemetry.record(SHOT, 1, i)
+    telemetry.close()
+
+    (path,) = (tmp_path / 'full').iterdir()
+    cut = tmp_path / 'cut.sbt.gz'
+    shutil.copy(path, cut)
+    with open(cut, 'r+b') as f:
+        f.truncate(os.path.getsize(cut) // 2)
+
+    events = _read(cut)
+    assert 0 < len(events) < 500
+    assert events['value'].tolist() == list(range(len(events)))